@@ -0,0 +1,56 @@
+"""
+Benchmark upload size against transcription latency for each audio encoding.
+
+Usage (from the repository root):
+    python -m benchmarks.upload_encoding_benchmark video.mp4 [--transcribe]
+
+Without --transcribe only encoding time and upload size are measured; with it,
+every encoding is also sent to the Whisper API (requires OPENAI_API_KEY).
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from services.media_service import MediaService
+from utils.constants import AUDIO_UPLOAD_ENCODINGS
+
+def run_benchmark(video_path: str, transcribe: bool = False):
+    openai_service = None
+    if transcribe:
+        from services.openai_service import OpenAIService
+        openai_service = OpenAIService()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        wav_path = MediaService.extract_audio(video_path, output_dir=temp_dir)
+        duration = MediaService.get_audio_duration(wav_path)
+        print(f"Audio duration: {duration:.1f}s")
+        print(f"{'encoding':<10}{'size (MB)':>12}{'MB/min':>10}{'encode (s)':>12}{'transcribe (s)':>16}")
+
+        for encoding in AUDIO_UPLOAD_ENCODINGS:
+            start = time.perf_counter()
+            upload_path = MediaService.encode_for_upload(wav_path, encoding)
+            encode_time = time.perf_counter() - start
+            size_mb = MediaService.check_file_size(upload_path)
+
+            transcribe_time = float('nan')
+            if openai_service:
+                start = time.perf_counter()
+                openai_service.transcribe_audio(upload_path)
+                transcribe_time = time.perf_counter() - start
+
+            print(f"{encoding:<10}{size_mb:>12.2f}{size_mb / (duration / 60):>10.2f}"
+                  f"{encode_time:>12.2f}{transcribe_time:>16.2f}")
+
+            if upload_path != wav_path:
+                os.remove(upload_path)
+    finally:
+        shutil.rmtree(temp_dir)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video_path")
+    parser.add_argument("--transcribe", action="store_true", help="Also measure Whisper API latency")
+    args = parser.parse_args()
+    run_benchmark(args.video_path, args.transcribe)
@@ -1,14 +1,23 @@
 import streamlit as st
+import altair as alt
 import os
-import tempfile
-import io
-import zipfile
 import base64
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from services.openai_service import OpenAIService
 from services.media_service import MediaService
 from services.subtitle_service import SubtitleService
 from services.timing_service import TimingService
-from utils.constants import SUPPORTED_LANGUAGES, SUPPORTED_VIDEO_FORMATS, SUPPORTED_SUBTITLE_FORMATS
+from services.artifact_service import ArtifactService
+from services.vad_service import VadService
+from services.export_service import ExportService
+from services.result_store import ResultStore, ResultCache
+from services.scheduler_service import SchedulerService, AdmissionError
+from services.segment_history import SegmentHistory
+from services.waveform_service import WaveformService
+from services.profiling_service import ProfilingService
+from services.library_service import LibraryService
+from utils.constants import SUPPORTED_LANGUAGES, SUPPORTED_VIDEO_FORMATS, SUPPORTED_SUBTITLE_FORMATS, AUDIO_UPLOAD_ENCODINGS, MUX_SUBTITLE_CODECS, MUX_LANGUAGE_CODES, ARTIFACT_SESSION_TTL_SECONDS, RESULT_CACHE_MAX_MB_PER_SESSION, TRANSLATION_BATCH_SIZE, SUBTITLE_BATCH_WORKERS, PROFILING_MAX_REPORTS, LIBRARY_PAGE_SIZE
 import time
 from moviepy.editor import VideoFileClip
 
@@ -68,12 +77,125 @@ openai_service = OpenAIService()
 media_service = MediaService()
 subtitle_service = SubtitleService()
 timing_service = TimingService()
+vad_service = VadService()
+export_service = ExportService()
+waveform_service = WaveformService()
+profiling_service = ProfilingService()
+
+@st.cache_resource
+def get_artifact_service():
+    """Process-wide temp artifact manager shared by all sessions"""
+    return ArtifactService()
+
+@st.cache_resource
+def get_result_store():
+    """Process-wide on-disk store for processed results"""
+    store = ResultStore()
+    store.purge_older_than(ARTIFACT_SESSION_TTL_SECONDS)
+    return store
+
+@st.cache_resource
+def get_library_service():
+    """Persistent full-text index of every processed subtitle"""
+    return LibraryService()
+
+@st.cache_resource
+def get_scheduler_service():
+    """Process-wide scheduler that all video processing goes through"""
+    return SchedulerService()
+
+artifact_service = get_artifact_service()
+result_store = get_result_store()
+scheduler_service = get_scheduler_service()
+library_service = get_library_service()
 
 # Initialize session states
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
 if 'processed_videos' not in st.session_state:
+    # Small per-video views only; heavy fields live in the result store
     st.session_state.processed_videos = {}
-if 'current_segments' not in st.session_state:
-    st.session_state.current_segments = {}
+if 'result_cache' not in st.session_state:
+    st.session_state.result_cache = ResultCache(RESULT_CACHE_MAX_MB_PER_SESSION * 1024 * 1024)
+
+def touch_session():
+    """Record activity of this session and clean up after sessions that have expired"""
+    for expired_session in artifact_service.touch_session(st.session_state.session_id):
+        result_store.delete_session(expired_session)
+        scheduler_service.cancel_session(expired_session)
+
+touch_session()
+
+def queue_heartbeat(queue_status):
+    """Callback for SchedulerService.wait_turn that shows the queue position and keeps the session alive"""
+    def on_wait(position):
+        touch_session()
+        queue_status.info(f"⏳ Waiting in queue (position {position})")
+
+    return on_wait
+
+def save_result(video_key, result, history=None):
+    """
+    Persist the heavy fields of a result and keep only a small view in session state.
+    An edit history is kept with the cached result so it counts against the cache budget
+    """
+    view = {key: value for key, value in result.items() if key not in ResultStore.HEAVY_FIELDS}
+    # A new job saved under an existing key replaces the old job's stored result and files
+    replaced = st.session_state.processed_videos.get(video_key)
+    if replaced and replaced['job_id'] != view['job_id']:
+        result_store.delete(replaced['job_id'])
+        st.session_state.result_cache.discard(replaced['job_id'])
+        artifact_service.release_job(replaced['job_id'])
+    view['digest'] = result_store.save(view['job_id'], st.session_state.session_id, result)
+    view['cue_count'] = len(result.get('segments') or [])
+    st.session_state.processed_videos[video_key] = view
+    cached = {field: result.get(field) for field in ResultStore.HEAVY_FIELDS}
+    if history is not None:
+        cached['history'] = history
+    st.session_state.result_cache.put(view['job_id'], cached)
+    # Keep the persistent library in sync so the cues outlive the session
+    library_service.index_video(
+        view['job_id'], export_service.base_name(video_key), view.get('target_language'),
+        result.get('segments') or [], result.get('translated_segments'),
+        fps=view.get('fps'), language_code=SUPPORTED_LANGUAGES.get(view.get('target_language'))
+    )
+
+def load_result(video_key):
+    """
+    Load a full result, reading its heavy fields through the per-session cache.
+    Returns None and forgets the video if its stored result has been reclaimed
+    """
+    view = st.session_state.processed_videos[video_key]
+    heavy = st.session_state.result_cache.get(view['job_id'])
+    if heavy is None:
+        heavy = result_store.load(view['job_id'])
+        if heavy is None:
+            del st.session_state.processed_videos[video_key]
+            return None
+        st.session_state.result_cache.put(view['job_id'], heavy)
+    return {**view, **{field: heavy.get(field) for field in ResultStore.HEAVY_FIELDS}}
+
+def write_session_file(file_name, data, replaces=None):
+    """
+    Write a payload (export archive, rendered subtitles, profile) to this session's
+    artifact dir, so it counts against the disk budget instead of session memory.
+    Returns its path; `replaces` is the path of an older payload to delete
+    """
+    job_id = st.session_state.get('session_files_job')
+    if not job_id or not artifact_service.has_job(job_id):
+        job_id, _ = artifact_service.create_job(st.session_state.session_id)
+        artifact_service.finish_job(job_id)
+        st.session_state.session_files_job = job_id
+    if replaces:
+        artifact_service.unregister(job_id, replaces)
+    path = os.path.join(artifact_service.job_dir(job_id), f"{uuid.uuid4().hex[:8]}_{file_name}")
+    if isinstance(data, bytes):
+        with open(path, "wb") as f:
+            f.write(data)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data)
+    return artifact_service.register(job_id, path)
 
 def srt_timestamp_to_seconds(timestamp):
     """Convert SRT timestamp to seconds"""
@@ -173,21 +295,122 @@ def create_download_component(key, subtitle_data, file_name, language=None):
         use_container_width=True
     )
 
-def update_subtitles(video_key, segments, subtitle_format):
+def update_subtitles(video_key, segments, subtitle_format, fps=23.976):
     """Update subtitles after timing adjustments"""
-    if subtitle_format == 'srt':
-        return subtitle_service.create_srt(segments)
-    return subtitle_service.create_vtt(segments)
+    return subtitle_service.create_subtitles(segments, subtitle_format, fps=fps or 23.976)
+
+def get_segment_history(video_data, create=False):
+    """
+    Edit history of a video's segments, kept with its cached result.
+    Returns None until the first edit unless create is set
+    """
+    cached = st.session_state.result_cache.get(video_data['job_id'])
+    history = cached.get('history') if cached else None
+    if history is None and create:
+        history = SegmentHistory({
+            'segments': video_data.get('segments') or [],
+            'translated_segments': video_data.get('translated_segments') or []
+        })
+    return history
+
+def apply_segment_history(video_key, video_data, history):
+    """Store the current history version as the video's segments and re-render its subtitles"""
+    video_data['segments'] = history.segments('segments')
+    video_data['original'] = update_subtitles(video_key, video_data['segments'], video_data['format'], video_data.get('fps'))
+    if video_data.get('translated_segments') is not None:
+        video_data['translated_segments'] = history.segments('translated_segments')
+        video_data['translated'] = update_subtitles(
+            video_key, video_data['translated_segments'], video_data['format'], video_data.get('fps')
+        )
+    save_result(video_key, video_data, history)
+
+    # Reset the per-segment inputs so they show the new timings
+    prefixes = (f"start_{video_key}_", f"end_{video_key}_")
+    for key in [key for key in st.session_state if str(key).startswith(prefixes)]:
+        del st.session_state[key]
+
+def display_waveform(video_key, video_data, segments):
+    """Display the audio waveform of the visible range with the segments drawn over it"""
+    audio_path = video_data.get('audio_path')
+    if not audio_path or not os.path.exists(audio_path):
+        return
+
+    cache_dir = os.path.join(os.path.dirname(audio_path), "waveform")
+    if not os.path.exists(os.path.join(cache_dir, "waveform.json")):
+        for path in waveform_service.build_pyramid(audio_path, cache_dir):
+            artifact_service.register(video_data['job_id'], path)
+
+    duration = waveform_service.get_view(cache_dir, 0.0, 0.0)['duration']
+    if duration <= 0:
+        return
+    start, end = st.slider(
+        "Waveform range (seconds)",
+        min_value=0.0,
+        max_value=float(duration),
+        value=(0.0, float(min(duration, 60.0))),
+        step=0.5,
+        key=f"waveform_range_{video_key}"
+    )
+    if end <= start:
+        return
+
+    # Only the peaks and segments of the visible range are sent to the browser
+    view = waveform_service.get_view(cache_dir, start, end)
+    peaks = [{'time': t, 'min': low, 'max': high} for t, low, high in zip(view['time'], view['min'], view['max'])]
+    cues = [
+        {'start': max(segment['start'], start), 'end': min(segment['end'], end),
+         'label': f"{i+1}. {segment['text'][:40]}"}
+        for i, segment in enumerate(segments)
+        if segment['end'] > start and segment['start'] < end
+    ]
+    x_scale = alt.Scale(domain=[start, end])
+    cue_layer = alt.Chart(alt.Data(values=cues)).mark_rect(opacity=0.25, color='#00ffbb').encode(
+        x=alt.X('start:Q', scale=x_scale, title='Time (s)'),
+        x2='end:Q',
+        tooltip=['label:N', 'start:Q', 'end:Q']
+    )
+    wave_layer = alt.Chart(alt.Data(values=peaks)).mark_area(color='#ffffff', opacity=0.8).encode(
+        x=alt.X('time:Q', scale=x_scale),
+        y=alt.Y('min:Q', scale=alt.Scale(domain=[-1, 1]), axis=None),
+        y2='max:Q'
+    )
+    st.altair_chart((cue_layer + wave_layer).properties(height=120), use_container_width=True)
 
 def display_timing_adjustment(video_key, video_data):
     """Display timing adjustment controls for a video"""
     st.markdown("#### Timing Adjustment")
     
-    # Get current segments
-    if video_key not in st.session_state.current_segments:
-        st.session_state.current_segments[video_key] = video_data.get('segments', [])
-    
-    segments = st.session_state.current_segments[video_key]
+    segments = video_data.get('segments') or []
+    # Only videos that have been edited hold a history
+    history = get_segment_history(video_data)
+
+    # Edit history
+    hcol1, hcol2, hcol3 = st.columns([1, 1, 4])
+    with hcol1:
+        if st.button("↶ Undo", key=f"undo_{video_key}", disabled=history is None or not history.can_undo()):
+            history.undo()
+            apply_segment_history(video_key, video_data, history)
+            st.rerun()
+    with hcol2:
+        if st.button("↷ Redo", key=f"redo_{video_key}", disabled=history is None or not history.can_redo()):
+            history.redo()
+            apply_segment_history(video_key, video_data, history)
+            st.rerun()
+    with hcol3:
+        if history is not None:
+            labels = history.labels()
+            st.caption(f"Version {history.cursor + 1} of {len(labels)}: {labels[history.cursor]}")
+    if history is not None and history.can_undo():
+        changes = history.diff('segments', history.cursor - 1, history.cursor)
+        with st.expander(f"Changes in this version ({len(changes)} segment(s))", expanded=False):
+            for change in changes[:50]:
+                before, after = change['before'], change['after']
+                st.text(f"{change['index'] + 1}. "
+                        f"[{before['start']:.2f}s - {before['end']:.2f}s] → "
+                        f"[{after['start']:.2f}s - {after['end']:.2f}s]"
+                        if before and after else f"{change['index'] + 1}. {before or after}")
+
+    display_waveform(video_key, video_data, segments)
     
     # Global offset adjustment
     col1, col2 = st.columns(2)
@@ -200,11 +423,10 @@ def display_timing_adjustment(video_key, video_data):
         )
         if st.button("Apply Offset", key=f"apply_offset_{video_key}"):
             adjusted_segments = timing_service.adjust_global_offset(segments, offset)
-            st.session_state.current_segments[video_key] = adjusted_segments
-            
             # Update subtitles
-            video_data['segments'] = adjusted_segments
-            video_data['original'] = update_subtitles(video_key, adjusted_segments, video_data['format'])
+            history = get_segment_history(video_data, create=True)
+            history.commit({'segments': adjusted_segments}, f"Offset {offset:+.2f}s")
+            apply_segment_history(video_key, video_data, history)
             st.success("Global offset applied successfully!")
             st.rerun()
     
@@ -219,14 +441,51 @@ def display_timing_adjustment(video_key, video_data):
         )
         if st.button("Apply Scaling", key=f"apply_scale_{video_key}"):
             adjusted_segments = timing_service.adjust_duration_scale(segments, scale)
-            st.session_state.current_segments[video_key] = adjusted_segments
-            
             # Update subtitles
-            video_data['segments'] = adjusted_segments
-            video_data['original'] = update_subtitles(video_key, adjusted_segments, video_data['format'])
+            history = get_segment_history(video_data, create=True)
+            history.commit({'segments': adjusted_segments}, f"Scale x{scale:.2f}")
+            apply_segment_history(video_key, video_data, history)
             st.success("Duration scaling applied successfully!")
             st.rerun()
     
+    # Automatic offset detection from the extracted audio
+    audio_path = video_data.get('audio_path')
+    if audio_path and os.path.exists(audio_path):
+        st.markdown("##### Auto Sync")
+        acol1, acol2, acol3 = st.columns(3)
+        with acol1:
+            max_offset = st.number_input(
+                "Maximum offset (seconds)",
+                value=30.0,
+                min_value=1.0,
+                step=5.0,
+                key=f"sync_max_offset_{video_key}"
+            )
+        with acol2:
+            detect_drift = st.checkbox(
+                "Also detect drift",
+                value=False,
+                help="Searches for a linear speed difference of up to ±5%",
+                key=f"sync_drift_{video_key}"
+            )
+        with acol3:
+            if st.button("Auto Sync", key=f"auto_sync_{video_key}"):
+                artifact_service.touch(video_data.get('job_id'))
+                sync = timing_service.auto_sync(
+                    audio_path, segments, max_offset, max_drift=0.05 if detect_drift else 0.0
+                )
+                history = get_segment_history(video_data, create=True)
+                history.commit({
+                    'segments': timing_service.apply_linear_timing(segments, sync['offset'], sync['scale']),
+                    'translated_segments': timing_service.apply_linear_timing(
+                        video_data.get('translated_segments') or [], sync['offset'], sync['scale']
+                    )
+                }, f"Auto sync {sync['offset']:+.2f}s")
+                apply_segment_history(video_key, video_data, history)
+                st.success(f"Applied offset {sync['offset']:+.2f}s, scale {sync['scale']:.3f} "
+                           f"(confidence {sync['confidence']:.2f})")
+                st.rerun()
+
     # Individual segment adjustment
     st.markdown("##### Adjust Individual Segments")
     for i, segment in enumerate(segments):
@@ -248,34 +507,137 @@ def display_timing_adjustment(video_key, video_data):
                 )
             
             if st.button("Update Timing", key=f"update_timing_{video_key}_{i}"):
-                adjusted_segments = timing_service.adjust_segment_timing(
-                    segments, i, new_start, new_end
+                adjusted_segment = timing_service.adjust_segment_timing(
+                    [segment], 0, new_start, new_end
+                )[0]
+                # Only the chunk holding this segment is copied into the new version
+                history = get_segment_history(video_data, create=True)
+                history.set_segment(
+                    'segments', i, f"Segment {i+1} timing",
+                    start=adjusted_segment['start'], end=adjusted_segment['end']
                 )
-                st.session_state.current_segments[video_key] = adjusted_segments
-                
-                # Update subtitles
-                video_data['segments'] = adjusted_segments
-                video_data['original'] = update_subtitles(video_key, adjusted_segments, video_data['format'])
+                apply_segment_history(video_key, video_data, history)
                 st.success(f"Segment {i+1} timing updated successfully!")
                 st.rerun()
 
-def process_single_video(video_file, target_language, subtitle_format):
-    """Process a single video file and return subtitles"""
-    temp_dir = None
+def display_mux_export(video_key, video_data):
+    """Export the video with soft subtitle tracks muxed in by stream copy"""
+    job_id = video_data.get('job_id')
+    if not video_data.get('video_path') or not os.path.exists(video_data['video_path']):
+        return
+
+    mcol1, mcol2 = st.columns([1, 2])
+    with mcol1:
+        container = st.selectbox(
+            "Container",
+            options=list(MUX_SUBTITLE_CODECS.keys()),
+            key=f"mux_container_{video_key}"
+        )
+
+    # Reuse the muxed file until the subtitles or the container change
+    mux_key = export_service.archive_key({video_key: video_data}, [container], ['original', 'translated'])
+    muxed = video_data.get('muxed')
+    with mcol2:
+        if muxed and muxed['key'] == mux_key and os.path.exists(muxed['path']):
+            artifact_service.touch(job_id)
+            with open(muxed['path'], 'rb') as f:
+                st.download_button(
+                    label="Download Video with Subtitles",
+                    data=f,
+                    file_name=os.path.basename(muxed['path']),
+                    mime="video/x-matroska" if container == 'mkv' else "video/mp4",
+                    key=f"download_mux_{video_key}",
+                    use_container_width=True
+                )
+        elif st.button("Create Video with Subtitles", key=f"mux_{video_key}", use_container_width=True):
+            job_dir = artifact_service.job_dir(job_id)
+            name = os.path.splitext(export_service.base_name(video_key))[0]
+            tracks = [
+                ('original', 'und', 'Original', video_data['segments']),
+                ('translated', MUX_LANGUAGE_CODES[SUPPORTED_LANGUAGES[video_data['target_language']]],
+                 video_data['target_language'], video_data.get('translated_segments'))
+            ]
+            subtitle_tracks = []
+            for track, language, title, segments in tracks:
+                if segments is None:
+                    continue
+                srt_path = os.path.join(job_dir, f"{name}_{track}.srt")
+                with open(srt_path, "w", encoding="utf-8") as f:
+                    f.write(subtitle_service.create_srt(segments))
+                artifact_service.register(job_id, srt_path)
+                subtitle_tracks.append({'path': srt_path, 'language': language, 'title': title})
+
+            output_path = os.path.join(job_dir, f"{name}_subtitled.{container}")
+            try:
+                with st.spinner("Muxing subtitles..."), scheduler_service.resource('ffmpeg'):
+                    media_service.mux_subtitles(video_data['video_path'], subtitle_tracks, output_path)
+                artifact_service.register(job_id, output_path)
+                st.session_state.processed_videos[video_key]['muxed'] = {'key': mux_key, 'path': output_path}
+            except Exception as e:
+                st.error(f"Error creating video with subtitles: {str(e)}")
+            else:
+                st.rerun()
+
+def live_translation_preview(placeholder, progress_bar, min_interval=0.25):
+    """Build a callback that shows translated cues in placeholder as they stream in"""
+    last_update = [0.0]
+
+    def on_progress(translated_segments, partial_segment, total):
+        # Throttle redraws; always draw the final state
+        now = time.monotonic()
+        if partial_segment is not None and now - last_update[0] < min_interval:
+            return
+        last_update[0] = now
+        lines = [f"{i+1}. [{segment['start']:.1f}s - {segment['end']:.1f}s] {segment['text']}"
+                 for i, segment in enumerate(translated_segments)]
+        if partial_segment is not None:
+            lines.append(f"{len(translated_segments)+1}. [{partial_segment['start']:.1f}s - "
+                         f"{partial_segment['end']:.1f}s] {partial_segment['text']}▌")
+        placeholder.text("\n".join(lines))
+        if total:
+            progress_bar.progress(min(len(translated_segments) / total, 1.0))
+
+    return on_progress
+
+def process_single_video(video_file, target_language, subtitle_format, audio_encoding='auto', trim_silence=True,
+                         on_translation_progress=None, time_ranges=None):
+    """Process a single video file and return (result, error)"""
+    job_id = None
     try:
         # Check file size
         file_size_mb = len(video_file.getbuffer()) / (1024 * 1024)
         if file_size_mb > MediaService.MAX_FILE_SIZE_MB:
-            return None, None, None, None, f"File {video_file.name} ({file_size_mb:.1f}MB) exceeds the maximum limit of {MediaService.MAX_FILE_SIZE_MB}MB."
+            return None, f"File {video_file.name} ({file_size_mb:.1f}MB) exceeds the maximum limit of {MediaService.MAX_FILE_SIZE_MB}MB."
 
-        # Save uploaded file temporarily
-        temp_dir = tempfile.mkdtemp()
-        temp_video_path = os.path.join(temp_dir, video_file.name)
+        # Save uploaded file into a tracked job directory
+        job_id, job_dir = artifact_service.create_job(st.session_state.session_id)
+        temp_video_path = os.path.join(job_dir, video_file.name)
         with open(temp_video_path, "wb") as f:
             f.write(video_file.getbuffer())
+        artifact_service.register(job_id, temp_video_path)
+
+        # Extract audio, only decoding the selected time ranges if any
+        range_map = []
+        with scheduler_service.resource('ffmpeg'):
+            if time_ranges:
+                audio_path, range_map = media_service.extract_audio_ranges(temp_video_path, time_ranges, job_dir)
+            else:
+                audio_path = media_service.extract_audio(temp_video_path, output_dir=job_dir)
+        artifact_service.register(job_id, audio_path)
+
+        # Cut silence and music out before upload, keeping a map back to the original timeline
+        speech_path, offset_map = audio_path, []
+        if trim_silence:
+            speech_path, offset_map = vad_service.trim_silence(
+                audio_path, os.path.join(job_dir, "audio_speech.wav")
+            )
+            if speech_path != audio_path:
+                artifact_service.register(job_id, speech_path)
 
-        # Extract audio
-        audio_path = media_service.extract_audio(temp_video_path)
+        # Encode audio for upload (FLAC/MP3/Opus are much smaller than WAV)
+        with scheduler_service.resource('ffmpeg'):
+            upload_path = media_service.encode_for_upload(speech_path, audio_encoding)
+        artifact_service.register(job_id, upload_path)
 
         # Get video FPS for SUB format
         video_fps = 23.976  # Default FPS
@@ -287,7 +649,10 @@ def process_single_video(video_file, target_language, subtitle_format):
                 pass
 
         # Transcribe audio
-        original_segments = openai_service.transcribe_audio(audio_path)
+        with scheduler_service.resource('api'):
+            original_segments = openai_service.transcribe_audio(upload_path)
+        original_segments = vad_service.remap_segments(original_segments, offset_map)
+        original_segments = vad_service.remap_segments(original_segments, range_map)
         
         # Create original language subtitles
         original_subtitles = subtitle_service.create_subtitles(
@@ -296,18 +661,28 @@ def process_single_video(video_file, target_language, subtitle_format):
             fps=video_fps
         )
 
-        # Translate subtitles
+        # Translate subtitles, streaming partial translations to the caller
         translated_segments = []
         for segment in original_segments:
-            translated_text = openai_service.translate_text(
-                segment['text'],
-                SUPPORTED_LANGUAGES[target_language]
-            )
+            translated_text = ""
+            with scheduler_service.resource('api'):
+                for translated_text in openai_service.translate_text_stream(
+                    segment['text'],
+                    SUPPORTED_LANGUAGES[target_language]
+                ):
+                    if on_translation_progress:
+                        on_translation_progress(translated_segments, {
+                            'start': segment['start'],
+                            'end': segment['end'],
+                            'text': translated_text
+                        }, len(original_segments))
             translated_segments.append({
                 'start': segment['start'],
                 'end': segment['end'],
                 'text': translated_text
             })
+        if on_translation_progress:
+            on_translation_progress(translated_segments, None, len(original_segments))
 
         # Create translated subtitles
         translated_subtitles = subtitle_service.create_subtitles(
@@ -316,13 +691,241 @@ def process_single_video(video_file, target_language, subtitle_format):
             fps=video_fps
         )
 
-        return original_subtitles, translated_subtitles, original_segments, temp_video_path, None
+        return {
+            'original': original_subtitles,
+            'translated': translated_subtitles,
+            'segments': original_segments,
+            'translated_segments': translated_segments,
+            'fps': video_fps,
+            'format': subtitle_format,
+            'target_language': target_language,
+            'video_path': temp_video_path,
+            # Partial audio does not share the video timeline, so it can't back the waveform or auto sync
+            'audio_path': None if range_map else audio_path,
+            'job_id': job_id
+        }, None
 
     except Exception as e:
-        return None, None, None, None, str(e)
+        if job_id:
+            artifact_service.release_job(job_id)
+        return None, str(e)
+    finally:
+        # Also runs when the script is stopped mid-job, so its files become evictable
+        if job_id:
+            artifact_service.finish_job(job_id)
+
+def translate_texts_batched(texts, target_language, on_progress=None):
+    """
+    Translate many texts with batched requests run in parallel, bounded by the API slots.
+    Returns one entry per text: the translation, or the exception that failed its batch
+    """
+    chunks = [texts[i:i + TRANSLATION_BATCH_SIZE] for i in range(0, len(texts), TRANSLATION_BATCH_SIZE)]
+    translations = [None] * len(chunks)
+
+    def translate_chunk(chunk):
+        with scheduler_service.resource('api'):
+            return openai_service.translate_batch(chunk, SUPPORTED_LANGUAGES[target_language])
+
+    done = 0
+    executor = ThreadPoolExecutor(max_workers=SUBTITLE_BATCH_WORKERS)
+    try:
+        futures = {executor.submit(translate_chunk, chunk): index for index, chunk in enumerate(chunks)}
+        # Streamlit calls stay on the script thread; workers only talk to the API
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                translations[index] = future.result()
+            except Exception as e:
+                # A failed batch only fails the cues it holds
+                translations[index] = [e] * len(chunks[index])
+            done += len(chunks[index])
+            if on_progress:
+                on_progress(done, len(texts))
     finally:
-        if temp_dir and 'temp_video_path' not in locals():
-            media_service.cleanup_temp_files([temp_dir])
+        # If the script is stopped, don't keep sending queued batches to the API
+        executor.shutdown(wait=False, cancel_futures=True)
+    return [text for chunk in translations for text in chunk]
+
+def process_subtitle_files(subtitle_files, target_language, subtitle_format, on_progress=None):
+    """
+    Translate existing subtitle files, skipping audio extraction and transcription.
+    Returns a list of (file name, result, error)
+    """
+    outcomes = []
+    parsed = []
+    for subtitle_file in subtitle_files:
+        input_format = os.path.splitext(subtitle_file.name)[1].lstrip('.').lower()
+        try:
+            content = subtitle_file.getvalue().decode('utf-8-sig', errors='replace')
+            segments = subtitle_service.parse_subtitles(content, input_format)
+            if not segments:
+                raise ValueError("No subtitle cues found")
+            parsed.append((subtitle_file.name, segments))
+        except Exception as e:
+            outcomes.append((subtitle_file.name, None, str(e)))
+
+    # All cues of all files share the same batched translation requests
+    texts = [segment['text'] for _, segments in parsed for segment in segments]
+    translations = iter(translate_texts_batched(texts, target_language, on_progress))
+
+    for name, segments in parsed:
+        file_translations = [next(translations) for _ in segments]
+        failure = next((text for text in file_translations if isinstance(text, Exception)), None)
+        if failure is not None:
+            outcomes.append((name, None, f"Translation failed: {failure}"))
+            continue
+        translated_segments = [
+            {'start': segment['start'], 'end': segment['end'], 'text': text}
+            for segment, text in zip(segments, file_translations)
+        ]
+        outcomes.append((name, {
+            'original': subtitle_service.create_subtitles(segments, subtitle_format),
+            'translated': subtitle_service.create_subtitles(translated_segments, subtitle_format),
+            'segments': segments,
+            'translated_segments': translated_segments,
+            'fps': 23.976,
+            'format': subtitle_format,
+            'target_language': target_language,
+            'video_path': None,
+            'audio_path': None,
+            'job_id': uuid.uuid4().hex
+        }, None))
+    return outcomes
+
+def store_profile(report):
+    """Keep the latest profiling reports; a report replaces older ones with the same label"""
+    if report is None:
+        return
+    # Only the top-functions table stays in session state; the profile data goes to disk
+    for field, file_name in (('pstats', 'profile.pstats'), ('collapsed', 'profile.collapsed.txt')):
+        data = report.pop(field)
+        report[f'{field}_path'] = write_session_file(file_name, data) if data else None
+    previous = st.session_state.get('profiles', [])
+    reports = [r for r in previous if r['label'] != report['label']] + [report]
+    dropped = [r for r in previous if r['label'] == report['label']] + reports[:-PROFILING_MAX_REPORTS]
+    for old_report in dropped:
+        for path in (old_report['pstats_path'], old_report['collapsed_path']):
+            if path:
+                artifact_service.unregister(st.session_state.session_files_job, path)
+    st.session_state.profiles = reports[-PROFILING_MAX_REPORTS:]
+
+def display_profiling_reports():
+    """Display captured profiles with their hot functions and downloads"""
+    reports = st.session_state.get('profiles')
+    if not reports:
+        return
+    st.markdown("### Profiling Reports")
+    for index, report in enumerate(reversed(reports)):
+        with st.expander(f"{report['label']} — {report['mode']}, {report['duration']:.2f}s", expanded=False):
+            if report.get('note'):
+                st.caption(report['note'])
+            st.dataframe(report['top'], use_container_width=True)
+            file_stem = "".join(c if c.isalnum() else "_" for c in report['label'])
+            # Profile data lives in the session's artifact dir and may have been evicted
+            if report['pstats_path'] and os.path.exists(report['pstats_path']):
+                with open(report['pstats_path'], 'rb') as f:
+                    st.download_button(
+                        label="Download pstats",
+                        data=f,
+                        file_name=f"{file_stem}.pstats",
+                        mime="application/octet-stream",
+                        key=f"download_pstats_{index}_{report['started_at']}"
+                    )
+            if report['collapsed_path'] and os.path.exists(report['collapsed_path']):
+                with open(report['collapsed_path'], 'rb') as f:
+                    st.download_button(
+                        label="Download collapsed stacks (flamegraph)",
+                        data=f,
+                        file_name=f"{file_stem}.collapsed.txt",
+                        mime="text/plain",
+                        key=f"download_collapsed_{index}_{report['started_at']}"
+                    )
+
+def display_library():
+    """Search the subtitle library and re-export indexed videos without calling the API"""
+    st.markdown("### Subtitle Library")
+    scol1, scol2 = st.columns([3, 1])
+    with scol1:
+        query = st.text_input("Search all processed subtitles", key="library_query")
+    with scol2:
+        language_filter = st.selectbox(
+            "Language",
+            options=['All', 'Original'] + list(SUPPORTED_LANGUAGES.keys()),
+            key="library_language"
+        )
+
+    if query.strip():
+        results = library_service.search(
+            query,
+            track='original' if language_filter == 'Original' else None,
+            language=SUPPORTED_LANGUAGES.get(language_filter)
+        )
+        if not results:
+            st.info("No matching subtitles found")
+        for cue in results:
+            label = 'original' if cue['track'] == 'original' else cue['target_language']
+            st.markdown(f"**{cue['name']}** · {label} · "
+                        f"`{cue['start_ms']} ms → {cue['end_ms']} ms` — {cue['snippet']}")
+
+    total = library_service.count_videos()
+    if not total:
+        return
+    st.markdown("##### Re-export an indexed video")
+    fcol1, fcol2 = st.columns([3, 1])
+    with fcol1:
+        name_filter = st.text_input("Find video by name", key="library_name_filter").strip()
+    matching = library_service.count_videos(name_filter) if name_filter else total
+    pages = max((matching + LIBRARY_PAGE_SIZE - 1) // LIBRARY_PAGE_SIZE, 1)
+    if st.session_state.get('library_page', 1) > pages:
+        st.session_state.library_page = pages
+    with fcol2:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, key="library_page")
+    videos = library_service.list_videos(name_filter, limit=LIBRARY_PAGE_SIZE, offset=(page - 1) * LIBRARY_PAGE_SIZE)
+    if not videos:
+        st.info("No indexed videos match this name")
+        return
+
+    rcol1, rcol2 = st.columns([3, 1])
+    with rcol1:
+        video = st.selectbox(
+            "Video",
+            options=videos,
+            format_func=lambda v: f"{v['name']} ({v['target_language']}, "
+                                  f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(v['updated_at']))})",
+            key="library_video"
+        )
+    with rcol2:
+        export_format = st.selectbox("Format", options=SUPPORTED_SUBTITLE_FORMATS, key="library_format")
+
+    # Subtitles are rendered only on request and reused until the selection changes
+    export_key = [video['video_id'], video['updated_at'], export_format]
+    cached = st.session_state.get('library_export')
+    # Rendered files are kept in the session's artifact dir, which may have been evicted
+    if not cached or cached['key'] != export_key or not all(os.path.exists(path) for _, path, _ in cached['files']):
+        if st.button("Prepare Download", key="library_prepare"):
+            indexed = library_service.get_video(video['video_id'])
+            if indexed is None:
+                st.warning("This video is no longer in the library")
+                return
+            fps = indexed['fps'] or 23.976
+            tracks = [(f"{indexed['name']}_original.{export_format}", indexed['segments'], None)]
+            if indexed['translated_segments']:
+                tracks.append((f"{indexed['name']}_{indexed['target_language']}.{export_format}",
+                               indexed['translated_segments'], indexed['target_language']))
+            for _, path, _ in (cached or {}).get('files', []):
+                artifact_service.unregister(st.session_state.session_files_job, path)
+            files = [
+                (file_name, write_session_file(file_name, subtitle_service.create_subtitles(segments, export_format, fps=fps)), language)
+                for file_name, segments, language in tracks
+            ]
+            st.session_state.library_export = {'key': export_key, 'files': files}
+            st.rerun()
+        return
+
+    dcols = st.columns(2)
+    for index, (file_name, path, language) in enumerate(cached['files']):
+        with dcols[index], open(path, 'rb') as f:
+            create_download_component(f"library_{index}_{video['video_id']}", f, file_name, language)
 
 def display_download_section(video_files):
     """Display download section with video preview and subtitle downloads"""
@@ -331,8 +934,14 @@ def display_download_section(video_files):
 
     st.markdown("### Download Processed Subtitles")
     
-    for video_key, video_data in st.session_state.processed_videos.items():
-        st.markdown(f"#### {video_key.split('_')[0]}")
+    for video_key in list(st.session_state.processed_videos):
+        # Heavy fields are loaded lazily from the result store
+        video_data = load_result(video_key)
+        if video_data is None:
+            st.warning(f"The results for {export_service.base_name(video_key)} have expired and were removed. "
+                       "Please process the file again.")
+            continue
+        st.markdown(f"#### {export_service.base_name(video_key)}")
         
         # Add timing adjustment section
         display_timing_adjustment(video_key, video_data)
@@ -345,7 +954,7 @@ def display_download_section(video_files):
             create_download_component(
                 f"orig_{video_key}",
                 video_data['original'],
-                f"{video_key.split('_')[0]}_original.{video_data['format']}"
+                f"{export_service.base_name(video_key)}_original.{video_data['format']}"
             )
         
         # Translated subtitles download
@@ -353,14 +962,17 @@ def display_download_section(video_files):
             create_download_component(
                 f"trans_{video_key}",
                 video_data['translated'],
-                f"{video_key.split('_')[0]}_{video_data['target_language']}.{video_data['format']}",
+                f"{export_service.base_name(video_key)}_{video_data['target_language']}.{video_data['format']}",
                 video_data['target_language']
             )
         
+        # Video with soft subtitle tracks
+        display_mux_export(video_key, video_data)
+
         # Preview section using expander
         with st.expander("Show Preview", expanded=False):
-            # Video preview with subtitles
-            if video_data.get('video_path'):
+            # Video preview with subtitles (the temp video may have been evicted)
+            if video_data.get('video_path') and os.path.exists(video_data['video_path']):
                 st.markdown("##### Video Preview with Subtitles")
                 # Always convert to VTT for video preview
                 preview_subtitles = subtitle_service.create_vtt(video_data['segments'])
@@ -416,40 +1028,56 @@ def display_download_section(video_files):
         
         st.divider()
 
-        # Add to selected_files for batch downloading
-        if 'selected_files' not in st.session_state:
-            st.session_state.selected_files = []
-            
-        st.session_state.selected_files.extend([
-            {
-                'filename': f"{video_key.split('_')[0]}_original.{video_data['format']}",
-                'data': video_data['original']
-            },
-            {
-                'filename': f"{video_key.split('_')[0]}_{video_data['target_language']}.{video_data['format']}",
-                'data': video_data['translated']
-            }
-        ])
-
-    # Add batch download button
-    if st.session_state.selected_files:
-        # Create zip file in memory
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for file in st.session_state.selected_files:
-                zip_file.writestr(file['filename'], file['data'])
-        
-        # Download button for zip file
-        st.download_button(
-            label="Download All Subtitle Files",
-            data=zip_buffer.getvalue(),
-            file_name="subtitles.zip",
-            mime="application/zip",
-            key="batch_download"
+    if st.session_state.processed_videos:
+        display_batch_export()
+
+def display_batch_export():
+    """Display the all-videos archive export, built only on demand"""
+    st.markdown("#### Export All Subtitles")
+    processed_videos = st.session_state.processed_videos
+    ecol1, ecol2 = st.columns(2)
+    with ecol1:
+        export_formats = st.multiselect(
+            "Formats",
+            options=SUPPORTED_SUBTITLE_FORMATS,
+            default=sorted({video_data['format'] for video_data in processed_videos.values()}),
+            key="export_formats"
         )
-        
-        # Clear selected files after creating zip
-        st.session_state.selected_files = []
+    with ecol2:
+        export_tracks = st.multiselect(
+            "Languages",
+            options=['original', 'translated'],
+            default=['original', 'translated'],
+            key="export_tracks"
+        )
+    if not export_formats or not export_tracks:
+        return
+
+    # The archive is rebuilt only when its content hash changes
+    archive_key = export_service.archive_key(processed_videos, export_formats, export_tracks)
+    cached = st.session_state.get('export_archive')
+    # The archive itself is kept in the session's artifact dir, which may have been evicted
+    if cached and cached['key'] == archive_key and os.path.exists(cached['path']):
+        with open(cached['path'], 'rb') as f:
+            st.download_button(
+                label="Download All Subtitle Files",
+                data=f,
+                file_name="subtitles.zip",
+                mime="application/zip",
+                key="batch_download"
+            )
+    elif st.button("Prepare Archive", key="prepare_archive"):
+        results = {video_key: load_result(video_key) for video_key in list(processed_videos)}
+        files = export_service.collect_files(
+            {video_key: result for video_key, result in results.items() if result is not None},
+            export_formats, export_tracks
+        )
+        st.session_state.export_archive = {
+            'key': archive_key,
+            'path': write_session_file("subtitles.zip", export_service.build_zip(files),
+                                       replaces=cached['path'] if cached else None)
+        }
+        st.rerun()
 
 def main():
     # Main title with SEO-friendly H1
@@ -586,22 +1214,33 @@ def main():
     
     # Clear results button
     col1, col2 = st.columns([1, 5])
+    with col2:
+        usage = artifact_service.disk_usage()
+        queue_stats = scheduler_service.stats()
+        st.caption(f"Temporary storage: {usage['used_mb']:.1f}MB / {usage['budget_mb']:.0f}MB "
+                   f"({usage['jobs']} job(s), {usage['sessions']} session(s)) · "
+                   f"Server queue: {queue_stats['running']} running, {queue_stats['queued']} waiting")
     with col1:
         if st.button("Clear All Results"):
-            # Clean up temporary video files
-            for video_data in st.session_state.processed_videos.values():
-                if video_data.get('video_path'):
-                    try:
-                        os.remove(video_data['video_path'])
-                    except:
-                        pass
+            # Clean up temporary job artifacts and stored results
+            artifact_service.release_session(st.session_state.session_id)
+            result_store.delete_session(st.session_state.session_id)
+            st.session_state.result_cache.clear()
             
             st.session_state.processed_videos = {}
-            st.session_state.current_segments = {}
-            if 'selected_files' in st.session_state:
-                st.session_state.selected_files = []
+            for key in ('export_archive', 'library_export', 'profiles', 'session_files_job'):
+                st.session_state.pop(key, None)
             st.rerun()
     
+    with st.expander("Diagnostics", expanded=False):
+        profiling_choice = st.selectbox(
+            "Profile jobs",
+            options=['off'] + list(ProfilingService.MODES),
+            help="'cprofile' records every call and exports pstats; 'sampling' samples stacks and exports flamegraph input",
+            key="profiling_mode"
+        )
+    profiling_mode = None if profiling_choice == 'off' else profiling_choice
+
     st.write("Upload videos to generate subtitles and translations")
     
     # File size warnings and information
@@ -621,8 +1260,19 @@ def main():
         help=f"Upload your video files here (Maximum size: {MediaService.MAX_FILE_SIZE_MB}MB per file)\nSupported formats: {', '.join(SUPPORTED_VIDEO_FORMATS)}"
     )
 
-    if video_files:
-        st.write(f"Selected {len(video_files)} video(s) for processing")
+    # Existing transcripts skip audio extraction and transcription entirely
+    subtitle_files = st.file_uploader(
+        "Or translate existing subtitle files",
+        type=SUPPORTED_SUBTITLE_FORMATS,
+        accept_multiple_files=True,
+        help=f"Upload subtitle files to translate without reprocessing the video\nSupported formats: {', '.join(SUPPORTED_SUBTITLE_FORMATS)}"
+    )
+
+    if video_files or subtitle_files:
+        if video_files:
+            st.write(f"Selected {len(video_files)} video(s) for processing")
+        if subtitle_files:
+            st.write(f"Selected {len(subtitle_files)} subtitle file(s) for translation")
 
         # Transcription settings
         st.subheader("Transcription and Translation Settings")
@@ -636,44 +1286,149 @@ def main():
             options=SUPPORTED_SUBTITLE_FORMATS
         )
 
-        if st.button("Process All Videos"):
+        audio_encoding, trim_silence, range_inputs = 'auto', True, {}
+        if video_files:
+            audio_encoding = st.selectbox(
+                "Audio upload encoding",
+                options=['auto'] + list(AUDIO_UPLOAD_ENCODINGS.keys()),
+                help="'auto' picks the highest quality encoding that keeps the upload small"
+            )
+
+            trim_silence = st.checkbox(
+                "Skip silence and music before transcription",
+                value=True,
+                help="Detects speech locally and only uploads speech regions; subtitle timings are mapped back to the original video"
+            )
+
+            with st.expander("Time ranges (optional)", expanded=False):
+                st.caption("Only process parts of a video, e.g. `0:30-2:00, 5:00-6:15` or `90-` for everything after 1:30. "
+                           "Leave empty to process the whole video.")
+                range_inputs = {
+                    i: st.text_input(video_file.name, key=f"time_ranges_{video_file.name}_{i}")
+                    for i, video_file in enumerate(video_files, 1)
+                }
+
+        if st.button("Process All Files"):
             # Create a container for the progress
             progress_container = st.container()
-            
-            # Process each video
-            for i, video_file in enumerate(video_files, 1):
+
+            # Translate subtitle files as a single batched job
+            if subtitle_files:
                 with progress_container:
-                    video_key = f"{video_file.name}_{i}"
-                    
-                    # Create an expander for each video
-                    with st.expander(f"Video {i}: {video_file.name}", expanded=True):
-                        st.write(f"Processing video {i}/{len(video_files)}")
-                        progress_bar = st.progress(0)
-                        
-                        # Process the video
-                        original_subtitles, translated_subtitles, original_segments, temp_video_path, error = process_single_video(
-                            video_file, target_language, subtitle_format
-                        )
-                        
-                        if error:
-                            st.error(f"Error processing {video_file.name}: {error}")
-                            continue
-                        
-                        # Store results in session state
-                        st.session_state.processed_videos[video_key] = {
-                            'original': original_subtitles,
-                            'translated': translated_subtitles,
-                            'segments': original_segments,
-                            'format': subtitle_format,
-                            'target_language': target_language,
-                            'video_path': temp_video_path
-                        }
+                    with st.expander(f"Subtitle files ({len(subtitle_files)})", expanded=True):
+                        queue_status = st.empty()
+                        ticket = None
+                        try:
+                            ticket = scheduler_service.submit(st.session_state.session_id)
+                            scheduler_service.wait_turn(
+                                ticket,
+                                on_wait=queue_heartbeat(queue_status)
+                            )
+                            queue_status.empty()
+                            progress_bar = st.progress(0)
+
+                            def on_progress(done, total):
+                                touch_session()
+                                progress_bar.progress(done / total if total else 1.0)
+
+                            outcomes = process_subtitle_files(
+                                subtitle_files, target_language, subtitle_format,
+                                on_progress=on_progress
+                            )
+                        except AdmissionError as e:
+                            queue_status.error(f"Subtitle files were not processed: {e}")
+                            outcomes = []
+                        finally:
+                            if ticket:
+                                scheduler_service.finish(ticket)
+
+                        for name, result, error in outcomes:
+                            if error:
+                                st.error(f"Error processing {name}: {error}")
+                                continue
+                            # Keyed by job so translating the same files again keeps both results
+                            video_key = f"{name}_s{result['job_id'][:8]}"
+                            save_result(video_key, result)
+                        if outcomes:
+                            progress_bar.progress(1.0)
+                            succeeded = sum(1 for _, result, _ in outcomes if result)
+                            st.success(f"✓ Translated {succeeded} of {len(subtitle_files)} subtitle file(s)")
+
+            # Validate time ranges before queueing
+            time_ranges = {}
+            for i, video_file in enumerate(video_files, 1):
+                try:
+                    time_ranges[i] = media_service.parse_time_ranges(range_inputs.get(i, ''))
+                except ValueError as e:
+                    st.error(f"Error processing {video_file.name}: {e}")
+
+            # Queue every video with the shared scheduler; admission control may reject some
+            tickets = {}
+            for i, video_file in enumerate(video_files, 1):
+                if i not in time_ranges:
+                    continue
+                try:
+                    tickets[i] = scheduler_service.submit(st.session_state.session_id)
+                except AdmissionError as e:
+                    st.warning(f"{video_file.name} was not queued: {e}")
+
+            # Process each video
+            try:
+                for i, video_file in enumerate(video_files, 1):
+                    if i not in tickets:
+                        continue
+                    with progress_container:
+                        video_key = f"{video_file.name}_{i}"
                         
-                        progress_bar.progress(1.0)
-                        st.success(f"✓ Processing completed")
+                        # Create an expander for each video
+                        with st.expander(f"Video {i}: {video_file.name}", expanded=True):
+                            queue_status = st.empty()
+                            try:
+                                scheduler_service.wait_turn(
+                                    tickets[i],
+                                    on_wait=queue_heartbeat(queue_status)
+                                )
+                            except AdmissionError as e:
+                                queue_status.error(f"Error processing {video_file.name}: {e}")
+                                continue
+                            queue_status.empty()
+
+                            st.write(f"Processing video {i}/{len(video_files)}")
+                            progress_bar = st.progress(0)
+                            live_preview = st.container(height=250).empty()
+                            
+                            # Process the video, showing translated cues as they arrive
+                            try:
+                                with profiling_service.capture(f"process_single_video {video_file.name}", profiling_mode) as report:
+                                    result, error = process_single_video(
+                                        video_file, target_language, subtitle_format, audio_encoding, trim_silence,
+                                        on_translation_progress=live_translation_preview(live_preview, progress_bar),
+                                        time_ranges=time_ranges[i]
+                                    )
+                                store_profile(report)
+                            finally:
+                                scheduler_service.finish(tickets[i])
+                            
+                            if error:
+                                st.error(f"Error processing {video_file.name}: {error}")
+                                continue
+                            
+                            # Store results out of session, keeping a small view in session state
+                            save_result(video_key, result)
+                            
+                            progress_bar.progress(1.0)
+                            st.success(f"✓ Processing completed")
+            finally:
+                # Withdraw tickets left over if the run is interrupted
+                for ticket in tickets.values():
+                    scheduler_service.finish(ticket)
 
-            # Display download section
-            display_download_section(video_files)
+    # Display download section for every processed video, including after reruns
+    with profiling_service.capture("display_download_section", profiling_mode) as report:
+        display_download_section(video_files)
+    store_profile(report)
+    display_library()
+    display_profiling_reports()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,208 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+from utils.constants import ARTIFACT_BASE_DIRNAME, ARTIFACT_DISK_BUDGET_MB, ARTIFACT_SESSION_TTL_SECONDS
+
+class ArtifactService:
+    """
+    Track temporary files per job and session, enforce a global disk budget
+    with LRU eviction and reclaim the files of expired sessions.
+    Job directories in the base dir that no job tracks (e.g. left behind by a
+    previous process) are deleted once they are older than the session TTL
+    """
+
+    def __init__(self, base_dir: Optional[str] = None,
+                 max_disk_mb: float = ARTIFACT_DISK_BUDGET_MB,
+                 session_ttl_seconds: float = ARTIFACT_SESSION_TTL_SECONDS):
+        self.base_dir = base_dir or os.path.join(tempfile.gettempdir(), ARTIFACT_BASE_DIRNAME)
+        os.makedirs(self.base_dir, exist_ok=True)
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.session_ttl_seconds = session_ttl_seconds
+        # job_id -> job record, ordered from least to most recently used
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sessions: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self.sweep_orphans()
+
+    def create_job(self, session_id: str) -> Tuple[str, str]:
+        """
+        Create a job directory owned by a session and return (job_id, job_dir)
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.base_dir, job_id)
+        os.makedirs(job_dir)
+        with self._lock:
+            self._sessions[session_id] = time.time()
+            self._jobs[job_id] = {
+                'session_id': session_id,
+                'dir': job_dir,
+                'files': {},
+                'last_access': time.time(),
+                # Jobs still producing files are never evicted by the disk budget
+                'in_progress': True
+            }
+        return job_id, job_dir
+
+    def register(self, job_id: str, path: str) -> str:
+        """
+        Record a file produced by a job and enforce the disk budget
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise KeyError(f"Unknown job: {job_id}")
+            job['files'][path] = os.path.getsize(path) if os.path.exists(path) else 0
+            self._touch_locked(job_id)
+            self._enforce_budget_locked(protected=job_id)
+        return path
+
+    def finish_job(self, job_id: str):
+        """
+        Mark a job as done producing files, making it eligible for budget eviction
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job['in_progress'] = False
+            self._enforce_budget_locked()
+
+    def unregister(self, job_id: str, path: str):
+        """
+        Delete a single tracked file of a job
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job['files'].pop(path, None)
+        if os.path.isfile(path):
+            os.remove(path)
+
+    def touch(self, job_id: str) -> bool:
+        """
+        Mark a job as recently used; returns False if it has been evicted
+        """
+        with self._lock:
+            if job_id not in self._jobs:
+                return False
+            self._touch_locked(job_id)
+            return True
+
+    def touch_session(self, session_id: str) -> List[str]:
+        """
+        Record session activity and reclaim sessions that have expired.
+        Returns the IDs of the reclaimed sessions
+        """
+        with self._lock:
+            self._sessions[session_id] = time.time()
+            return self.reclaim_expired_sessions()
+
+    def has_job(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._jobs
+
+    def job_dir(self, job_id: str) -> Optional[str]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job['dir'] if job else None
+
+    def release_job(self, job_id: str):
+        """
+        Delete all files of a job
+        """
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is not None:
+            shutil.rmtree(job['dir'], ignore_errors=True)
+
+    def release_session(self, session_id: str):
+        """
+        Delete all files of every job owned by a session
+        """
+        with self._lock:
+            job_ids = [job_id for job_id, job in self._jobs.items()
+                       if job['session_id'] == session_id]
+            self._sessions.pop(session_id, None)
+        for job_id in job_ids:
+            self.release_job(job_id)
+
+    def reclaim_expired_sessions(self) -> List[str]:
+        """
+        Release the jobs of sessions idle for longer than the session TTL.
+        Sessions that still own a job in progress are never reclaimed
+        """
+        now = time.time()
+        with self._lock:
+            busy = {job['session_id'] for job in self._jobs.values() if job['in_progress']}
+            expired = [session_id for session_id, last_seen in self._sessions.items()
+                       if now - last_seen > self.session_ttl_seconds and session_id not in busy]
+        for session_id in expired:
+            self.release_session(session_id)
+        self.sweep_orphans()
+        return expired
+
+    def sweep_orphans(self) -> List[str]:
+        """
+        Delete untracked job directories not modified within the session TTL.
+        Returns the deleted paths
+        """
+        cutoff = time.time() - self.session_ttl_seconds
+        with self._lock:
+            tracked = {job['dir'] for job in self._jobs.values()}
+        removed = []
+        for entry in os.scandir(self.base_dir):
+            if not entry.is_dir(follow_symlinks=False) or entry.path in tracked:
+                continue
+            if self._last_modified(entry.path) < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed.append(entry.path)
+        return removed
+
+    def disk_usage(self) -> Dict[str, Any]:
+        """
+        Report current disk usage of tracked artifacts
+        """
+        with self._lock:
+            used = sum(self._job_size(job) for job in self._jobs.values())
+            return {
+                'used_bytes': used,
+                'budget_bytes': self.max_disk_bytes,
+                'used_mb': used / (1024 * 1024),
+                'budget_mb': self.max_disk_bytes / (1024 * 1024),
+                'jobs': len(self._jobs),
+                'sessions': len(self._sessions)
+            }
+
+    def _touch_locked(self, job_id: str):
+        self._jobs[job_id]['last_access'] = time.time()
+        self._jobs.move_to_end(job_id)
+
+    def _enforce_budget_locked(self, protected: Optional[str] = None):
+        used = sum(self._job_size(job) for job in self._jobs.values())
+        for job_id in list(self._jobs.keys()):
+            if used <= self.max_disk_bytes:
+                break
+            if job_id == protected or self._jobs[job_id]['in_progress']:
+                continue
+            used -= self._job_size(self._jobs[job_id])
+            job = self._jobs.pop(job_id)
+            shutil.rmtree(job['dir'], ignore_errors=True)
+
+    @staticmethod
+    def _last_modified(path: str) -> float:
+        latest = os.path.getmtime(path)
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+                except OSError:
+                    pass
+        return latest
+
+    @staticmethod
+    def _job_size(job: Dict[str, Any]) -> int:
+        return sum(job['files'].values())
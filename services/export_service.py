@@ -0,0 +1,74 @@
+import hashlib
+import io
+import json
+import zipfile
+from typing import Dict, Any, List, Tuple
+from services.subtitle_service import SubtitleService
+
+class ExportService:
+    # Bundles larger than this are stored uncompressed; subtitle text compresses
+    # well but DEFLATE on big bundles costs more CPU than it saves in transfer
+    STORED_THRESHOLD_MB = 20
+
+    @staticmethod
+    def base_name(video_key: str) -> str:
+        # Keys are '{file name}_{suffix}'; file names may contain underscores themselves
+        return video_key.rsplit('_', 1)[0]
+
+    @staticmethod
+    def archive_key(processed_videos: Dict[str, Dict[str, Any]], formats: List[str], tracks: List[str]) -> str:
+        """
+        Content hash of everything that ends up in the archive.
+        Works on the small per-video views, using the stored content digest of each result
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([sorted(formats), sorted(tracks)]).encode())
+        for video_key in sorted(processed_videos):
+            video_data = processed_videos[video_key]
+            digest.update(json.dumps([
+                video_key,
+                video_data.get('target_language'),
+                video_data.get('fps'),
+                video_data.get('digest')
+            ], sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def collect_files(processed_videos: Dict[str, Dict[str, Any]], formats: List[str],
+                      tracks: List[str]) -> List[Tuple[str, str]]:
+        """
+        Render every requested format and track of every video as (filename, content)
+        """
+        files = []
+        for video_key, video_data in processed_videos.items():
+            name = ExportService.base_name(video_key)
+            fps = video_data.get('fps', 23.976)
+            track_segments = {
+                'original': ('original', video_data.get('segments')),
+                'translated': (video_data['target_language'], video_data.get('translated_segments'))
+            }
+            for track in tracks:
+                label, segments = track_segments[track]
+                for subtitle_format in formats:
+                    if segments is not None:
+                        content = SubtitleService.create_subtitles(segments, subtitle_format, fps=fps)
+                    elif subtitle_format == video_data['format']:
+                        # Results without stored segments can only be exported as rendered
+                        content = video_data[track]
+                    else:
+                        continue
+                    files.append((f"{name}_{label}.{subtitle_format}", content))
+        return files
+
+    @staticmethod
+    def build_zip(files: List[Tuple[str, str]]) -> bytes:
+        """
+        Build a zip archive, using stored compression for large bundles
+        """
+        total_mb = sum(len(content) for _, content in files) / (1024 * 1024)
+        compression = zipfile.ZIP_STORED if total_mb > ExportService.STORED_THRESHOLD_MB else zipfile.ZIP_DEFLATED
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, 'w', compression) as zip_file:
+            for filename, content in files:
+                zip_file.writestr(filename, content)
+        return zip_buffer.getvalue()
@@ -0,0 +1,178 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+from utils.constants import LIBRARY_DB_PATH, LIBRARY_SEARCH_LIMIT, LIBRARY_PAGE_SIZE
+
+class LibraryService:
+    """
+    Persistent subtitle library with a SQLite FTS5 full-text index.
+    Every processed video is stored with its original and translated cues so
+    past lines can be searched and re-exported without calling the API again
+    """
+
+    def __init__(self, db_path: str = LIBRARY_DB_PATH):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS videos (
+                    video_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    target_language TEXT,
+                    fps REAL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS cues (
+                    id INTEGER PRIMARY KEY,
+                    video_id TEXT NOT NULL REFERENCES videos (video_id) ON DELETE CASCADE,
+                    track TEXT NOT NULL,
+                    language TEXT,
+                    cue_index INTEGER NOT NULL,
+                    start_ms INTEGER NOT NULL,
+                    end_ms INTEGER NOT NULL,
+                    text TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS cues_video ON cues (video_id, track, cue_index);
+                CREATE VIRTUAL TABLE IF NOT EXISTS cues_fts USING fts5(
+                    text, content='cues', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+                );
+                CREATE TRIGGER IF NOT EXISTS cues_ai AFTER INSERT ON cues BEGIN
+                    INSERT INTO cues_fts (rowid, text) VALUES (new.id, new.text);
+                END;
+                CREATE TRIGGER IF NOT EXISTS cues_ad AFTER DELETE ON cues BEGIN
+                    INSERT INTO cues_fts (cues_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                END;
+            """)
+
+    def index_video(self, video_id: str, name: str, target_language: Optional[str],
+                    segments: List[Dict[str, Any]], translated_segments: Optional[List[Dict[str, Any]]] = None,
+                    fps: Optional[float] = None, language_code: Optional[str] = None):
+        """
+        Store (or replace) a video's original and translated cues in the index
+        """
+        rows = []
+        tracks = [('original', None, segments), ('translated', language_code, translated_segments or [])]
+        for track, language, track_segments in tracks:
+            for index, segment in enumerate(track_segments):
+                rows.append((
+                    video_id, track, language, index,
+                    int(round(segment['start'] * 1000)), int(round(segment['end'] * 1000)),
+                    segment['text']
+                ))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cues WHERE video_id = ?", (video_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO videos (video_id, name, target_language, fps, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (video_id, name, target_language, fps, time.time())
+            )
+            self._conn.executemany(
+                "INSERT INTO cues (video_id, track, language, cue_index, start_ms, end_ms, text) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def delete_video(self, video_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cues WHERE video_id = ?", (video_id,))
+            self._conn.execute("DELETE FROM videos WHERE video_id = ?", (video_id,))
+
+    @staticmethod
+    def to_match_query(query: str) -> str:
+        """
+        Turn free text into an FTS5 query matching all words; the last word
+        also matches as a prefix so results show up while typing
+        """
+        words = [word.replace('"', '""') for word in query.split()]
+        terms = [f'"{word}"' for word in words]
+        if terms:
+            terms[-1] += '*'
+        return ' '.join(terms)
+
+    def search(self, query: str, track: Optional[str] = None, language: Optional[str] = None,
+               video_id: Optional[str] = None, limit: int = LIBRARY_SEARCH_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Full-text search over all indexed cues, best matches first.
+        Returns cues with their video, track, language and start/end in milliseconds
+        """
+        match = self.to_match_query(query)
+        if not match:
+            return []
+        sql = """
+            SELECT c.video_id, v.name, v.target_language, c.track, c.language, c.cue_index,
+                   c.start_ms, c.end_ms, c.text,
+                   snippet(cues_fts, 0, '**', '**', '…', 12) AS snippet
+            FROM cues_fts
+            JOIN cues c ON c.id = cues_fts.rowid
+            JOIN videos v ON v.video_id = c.video_id
+            WHERE cues_fts MATCH ?
+        """
+        params: List[Any] = [match]
+        if track:
+            sql += " AND c.track = ?"
+            params.append(track)
+        if language:
+            sql += " AND c.language = ?"
+            params.append(language)
+        if video_id:
+            sql += " AND c.video_id = ?"
+            params.append(video_id)
+        sql += " ORDER BY bm25(cues_fts) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def _name_filter(name: Optional[str]):
+        if not name:
+            return "", []
+        pattern = name.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return " WHERE name LIKE ? ESCAPE '\\'", [f"%{pattern}%"]
+
+    def list_videos(self, name: Optional[str] = None, limit: int = LIBRARY_PAGE_SIZE,
+                    offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        A page of indexed videos, most recently updated first, optionally
+        filtered by a case-insensitive name substring
+        """
+        where, params = self._name_filter(name)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT video_id, name, target_language, fps, updated_at FROM videos" + where +
+                " ORDER BY updated_at DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_videos(self, name: Optional[str] = None) -> int:
+        where, params = self._name_filter(name)
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM videos" + where, params).fetchone()[0]
+
+    def get_video(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        A video's metadata with its 'segments' and 'translated_segments' in seconds
+        """
+        with self._lock:
+            video = self._conn.execute("SELECT * FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+            if video is None:
+                return None
+            cues = self._conn.execute(
+                "SELECT track, start_ms, end_ms, text FROM cues WHERE video_id = ? ORDER BY track, cue_index",
+                (video_id,)
+            ).fetchall()
+        result = dict(video)
+        result['segments'] = []
+        result['translated_segments'] = []
+        for cue in cues:
+            key = 'segments' if cue['track'] == 'original' else 'translated_segments'
+            result[key].append({'start': cue['start_ms'] / 1000, 'end': cue['end_ms'] / 1000, 'text': cue['text']})
+        return result
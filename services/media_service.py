@@ -1,9 +1,11 @@
 import os
 from moviepy.editor import VideoFileClip
 import tempfile
-from typing import Tuple
+from typing import Tuple, Optional, List, Dict
 import shutil
 import subprocess
+import wave
+from utils.constants import AUDIO_UPLOAD_ENCODINGS, AUDIO_AUTO_ENCODING_ORDER, AUDIO_UPLOAD_TARGET_MB, MUX_SUBTITLE_CODECS
 
 class MediaService:
     MAX_FILE_SIZE_MB = 25
@@ -17,17 +19,19 @@ class MediaService:
         return size_bytes / (1024 * 1024)
 
     @staticmethod
-    def compress_audio(input_path: str, output_path: str) -> str:
+    def compress_audio(input_path: str, output_path: str, encoding: str = 'wav') -> str:
         """
-        Compress audio using ffmpeg with 16kHz mono format
+        Compress audio using ffmpeg with 16kHz mono format and the given upload encoding
         """
+        if encoding not in AUDIO_UPLOAD_ENCODINGS:
+            raise ValueError(f"Unsupported audio encoding: {encoding}")
         try:
             command = [
                 'ffmpeg', '-y',  # Overwrite output file if it exists
                 '-i', input_path,
                 '-ar', '16000',  # Set sample rate to 16kHz
                 '-ac', '1',      # Convert to mono
-                '-c:a', 'pcm_s16le',  # Use 16-bit PCM encoding
+                *AUDIO_UPLOAD_ENCODINGS[encoding]['codec_args'],
                 output_path
             ]
             subprocess.run(command, check=True, capture_output=True)
@@ -36,16 +40,18 @@ class MediaService:
             raise Exception(f"Audio compression failed: {str(e)}")
 
     @staticmethod
-    def extract_audio(video_path: str) -> str:
+    def extract_audio(video_path: str, output_dir: Optional[str] = None) -> str:
         """
-        Extract and compress audio from video file and save as WAV
+        Extract and compress audio from video file and save as WAV.
+        The audio is written to output_dir when given, otherwise to a new temp directory
         """
         # Check input video size
         video_size = MediaService.check_file_size(video_path)
         if video_size > MediaService.MAX_FILE_SIZE_MB:
             raise ValueError(f"Video file size ({video_size:.1f}MB) exceeds the maximum limit of {MediaService.MAX_FILE_SIZE_MB}MB")
 
-        temp_dir = tempfile.mkdtemp()
+        owns_dir = output_dir is None
+        temp_dir = tempfile.mkdtemp() if owns_dir else output_dir
         temp_audio_path = os.path.join(temp_dir, "temp_audio.wav")
         final_audio_path = os.path.join(temp_dir, "audio.wav")
 
@@ -63,18 +69,196 @@ class MediaService:
             # Clean up temporary audio file
             os.remove(temp_audio_path)
             
-            # Check final audio size
-            audio_size = MediaService.check_file_size(final_audio_path)
-            if audio_size > MediaService.MAX_FILE_SIZE_MB:
-                raise ValueError(f"Compressed audio file size ({audio_size:.1f}MB) still exceeds the maximum limit")
-
             return final_audio_path
 
         except Exception as e:
             # Clean up in case of error
-            shutil.rmtree(temp_dir)
+            if owns_dir:
+                shutil.rmtree(temp_dir)
+            else:
+                MediaService.cleanup_temp_files([temp_audio_path, final_audio_path])
             raise e
 
+    @staticmethod
+    def parse_time_ranges(text: str) -> List[Tuple[float, Optional[float]]]:
+        """
+        Parse ranges such as "0:30-2:00, 5:00-6:15, 90-" into sorted, merged
+        (start, end) seconds; an empty end means until the end of the video
+        """
+        def to_seconds(value: str) -> float:
+            seconds = 0.0
+            for part in value.strip().split(':'):
+                seconds = seconds * 60 + float(part)
+            return seconds
+
+        ranges = []
+        for item in text.replace(';', ',').split(','):
+            if not item.strip():
+                continue
+            if '-' not in item:
+                raise ValueError(f"Invalid time range: {item.strip()} (expected start-end)")
+            start, end = item.split('-', 1)
+            start = to_seconds(start) if start.strip() else 0.0
+            end = to_seconds(end) if end.strip() else None
+            if end is not None and end <= start:
+                raise ValueError(f"Invalid time range: {item.strip()} (end must be after start)")
+            ranges.append((start, end))
+
+        merged = []
+        for start, end in sorted(ranges, key=lambda r: r[0]):
+            if merged and (merged[-1][1] is None or start <= merged[-1][1]):
+                last_start, last_end = merged[-1]
+                merged[-1] = (last_start, None if last_end is None or end is None else max(last_end, end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    @staticmethod
+    def extract_audio_ranges(video_path: str, ranges: List[Tuple[float, Optional[float]]],
+                             output_dir: str) -> Tuple[str, List[Dict[str, float]]]:
+        """
+        Extract 16kHz mono WAV audio for the given time ranges only.
+        Each range is decoded with ffmpeg input seeking (-ss before -i), so skipped
+        parts of the video are never decoded. Returns the concatenated WAV and an
+        offset map ({'trimmed_start', 'original_start', 'duration'}) back to the
+        original timeline
+        """
+        video_size = MediaService.check_file_size(video_path)
+        if video_size > MediaService.MAX_FILE_SIZE_MB:
+            raise ValueError(f"Video file size ({video_size:.1f}MB) exceeds the maximum limit of {MediaService.MAX_FILE_SIZE_MB}MB")
+
+        final_audio_path = os.path.join(output_dir, "audio.wav")
+        part_paths = []
+        offset_map = []
+        try:
+            trimmed_start = 0.0
+            for index, (start, end) in enumerate(ranges):
+                part_path = os.path.join(output_dir, f"audio_part_{index}.wav")
+                command = ['ffmpeg', '-y', '-ss', f"{start:.3f}"]
+                if end is not None:
+                    command += ['-t', f"{end - start:.3f}"]
+                command += ['-i', video_path, '-vn', '-ar', '16000', '-ac', '1', '-c:a', 'pcm_s16le', part_path]
+                try:
+                    subprocess.run(command, check=True, capture_output=True)
+                except subprocess.CalledProcessError as e:
+                    raise Exception(f"Audio extraction failed: {str(e)}")
+                part_paths.append(part_path)
+
+                duration = MediaService.get_audio_duration(part_path)
+                offset_map.append({
+                    'trimmed_start': trimmed_start,
+                    'original_start': start,
+                    'duration': duration
+                })
+                trimmed_start += duration
+
+            if trimmed_start <= 0:
+                raise ValueError("The selected time ranges contain no audio")
+
+            with wave.open(final_audio_path, 'wb') as output:
+                for index, part_path in enumerate(part_paths):
+                    with wave.open(part_path, 'rb') as part:
+                        if index == 0:
+                            output.setparams(part.getparams())
+                        output.writeframes(part.readframes(part.getnframes()))
+            return final_audio_path, offset_map
+
+        except Exception:
+            MediaService.cleanup_temp_files([final_audio_path])
+            raise
+        finally:
+            MediaService.cleanup_temp_files(part_paths)
+
+    @staticmethod
+    def get_audio_duration(wav_path: str) -> float:
+        """
+        Get WAV duration in seconds from its header
+        """
+        with wave.open(wav_path, 'rb') as wav:
+            return wav.getnframes() / float(wav.getframerate())
+
+    @staticmethod
+    def estimate_encoded_size_mb(duration: float, encoding: str) -> float:
+        """
+        Estimate the upload size in MB of audio of the given duration
+        """
+        return AUDIO_UPLOAD_ENCODINGS[encoding]['kbps'] * 1000 / 8 * duration / (1024 * 1024)
+
+    @staticmethod
+    def select_upload_encoding(duration: float, target_mb: float = AUDIO_UPLOAD_TARGET_MB) -> str:
+        """
+        Pick the highest fidelity encoding whose estimated size fits the target,
+        falling back to the smallest one
+        """
+        for encoding in AUDIO_AUTO_ENCODING_ORDER:
+            if MediaService.estimate_encoded_size_mb(duration, encoding) <= target_mb:
+                return encoding
+        return AUDIO_AUTO_ENCODING_ORDER[-1]
+
+    @staticmethod
+    def encode_for_upload(wav_path: str, encoding: str = 'auto') -> str:
+        """
+        Encode the extracted WAV for upload to the transcription API.
+        With 'auto', the encoding is chosen from the audio duration; if the result
+        still exceeds the maximum size the next smaller encoding is tried
+        """
+        if encoding == 'wav':
+            candidates = ['wav']
+        elif encoding == 'auto':
+            first = MediaService.select_upload_encoding(MediaService.get_audio_duration(wav_path))
+            candidates = AUDIO_AUTO_ENCODING_ORDER[AUDIO_AUTO_ENCODING_ORDER.index(first):]
+        else:
+            candidates = [encoding]
+
+        base_path = os.path.splitext(wav_path)[0]
+        for candidate in candidates:
+            if candidate == 'wav':
+                upload_path = wav_path
+            else:
+                upload_path = f"{base_path}_upload.{AUDIO_UPLOAD_ENCODINGS[candidate]['extension']}"
+                MediaService.compress_audio(wav_path, upload_path, candidate)
+
+            audio_size = MediaService.check_file_size(upload_path)
+            if audio_size <= MediaService.MAX_FILE_SIZE_MB:
+                return upload_path
+            if upload_path != wav_path:
+                os.remove(upload_path)
+
+        raise ValueError(f"Compressed audio file size ({audio_size:.1f}MB) still exceeds the maximum limit")
+
+    @staticmethod
+    def mux_subtitles(video_path: str, subtitle_tracks: List[Dict[str, str]], output_path: str) -> str:
+        """
+        Write soft subtitle tracks into an MKV or MP4 container.
+        Audio and video are stream-copied, so no re-encoding takes place.
+        Each track is a dict with 'path' (SRT file), 'language' (ISO 639-2) and 'title'
+        """
+        container = os.path.splitext(output_path)[1].lstrip('.').lower()
+        if container not in MUX_SUBTITLE_CODECS:
+            raise ValueError(f"Unsupported output container: {container}")
+
+        command = ['ffmpeg', '-y', '-i', video_path]
+        for track in subtitle_tracks:
+            command += ['-i', track['path']]
+        command += ['-map', '0:v?', '-map', '0:a?']
+        for i in range(len(subtitle_tracks)):
+            command += ['-map', f'{i + 1}:0']
+        command += ['-c:v', 'copy', '-c:a', 'copy', '-c:s', MUX_SUBTITLE_CODECS[container]]
+        for i, track in enumerate(subtitle_tracks):
+            command += [
+                f'-metadata:s:s:{i}', f"language={track['language']}",
+                f'-metadata:s:s:{i}', f"title={track['title']}"
+            ]
+        if subtitle_tracks:
+            command += ['-disposition:s:0', 'default']
+        command.append(output_path)
+
+        try:
+            subprocess.run(command, check=True, capture_output=True)
+            return output_path
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Subtitle muxing failed: {e.stderr.decode(errors='ignore')[-500:]}")
+
     @staticmethod
     def get_video_duration(video_path: str) -> float:
         """
@@ -91,6 +275,8 @@ class MediaService:
         Clean up temporary files and directories
         """
         for path in file_paths:
+            if not path:
+                continue
             if os.path.isfile(path):
                 os.remove(path)
             elif os.path.isdir(path):
@@ -1,6 +1,7 @@
 import os
+import json
 from openai import OpenAI
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator
 
 class OpenAIService:
     def __init__(self):
@@ -9,33 +10,40 @@ class OpenAIService:
     def transcribe_audio(self, audio_file_path: str) -> List[Dict[str, Any]]:
         """
         Transcribe audio using Whisper API and format the response into segments
+        with the start/end times Whisper reports for each segment
         """
         with open(audio_file_path, "rb") as audio_file:
             response = self.client.audio.transcriptions.create(
                 model="whisper-1",
-                file=audio_file
+                file=audio_file,
+                response_format="verbose_json",
+                timestamp_granularities=["segment"]
             )
-            
-            # Split the text into sentences and create time-aligned segments
-            # Since the new API doesn't provide detailed timing, we'll estimate it
-            text = response.text
-            sentences = [s.strip() for s in text.split('.') if s.strip()]
-            
-            # Create segments with estimated timing (3 seconds per sentence)
-            segments = []
-            current_time = 0
-            for sentence in sentences:
-                # Estimate 3 seconds per sentence
-                segment_duration = 3
-                segments.append({
-                    'start': current_time,
-                    'end': current_time + segment_duration,
-                    'text': sentence + '.'
-                })
-                current_time += segment_duration
-            
+
+        segments = []
+        for segment in getattr(response, 'segments', None) or []:
+            if isinstance(segment, dict):
+                start, end, text = segment['start'], segment['end'], segment['text']
+            else:
+                start, end, text = segment.start, segment.end, segment.text
+            if text.strip():
+                segments.append({'start': float(start), 'end': float(end), 'text': text.strip()})
+        if segments:
             return segments
 
+        # No segment timestamps in the reply: estimate 3 seconds per sentence
+        sentences = [s.strip() for s in response.text.split('.') if s.strip()]
+        current_time = 0
+        for sentence in sentences:
+            segment_duration = 3
+            segments.append({
+                'start': current_time,
+                'end': current_time + segment_duration,
+                'text': sentence + '.'
+            })
+            current_time += segment_duration
+        return segments
+
     def translate_text(self, text: str, target_language: str) -> str:
         """
         Translate text using GPT-4
@@ -46,3 +54,46 @@ class OpenAIService:
             messages=[{"role": "user", "content": prompt}]
         )
         return response.choices[0].message.content
+
+    def translate_text_stream(self, text: str, target_language: str) -> Iterator[str]:
+        """
+        Translate text using GPT-4 with a streamed completion, yielding the
+        translation accumulated so far as each chunk arrives
+        """
+        prompt = f"Translate the following text to {target_language}:\n\n{text}"
+        stream = self.client.chat.completions.create(
+            model="gpt-4o",
+            messages=[{"role": "user", "content": prompt}],
+            stream=True
+        )
+        translated = ""
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                translated += chunk.choices[0].delta.content
+                yield translated
+
+    def translate_batch(self, texts: List[str], target_language: str) -> List[str]:
+        """
+        Translate several texts with a single GPT-4 request.
+        Falls back to one request per text if the reply does not line up
+        """
+        if not texts:
+            return []
+        prompt = (
+            f"Translate each string in the following JSON array to {target_language}. "
+            'Reply with a JSON object {"translations": [...]} containing exactly one '
+            "translated string per input string, in the same order.\n\n"
+            + json.dumps(texts, ensure_ascii=False)
+        )
+        response = self.client.chat.completions.create(
+            model="gpt-4o",
+            messages=[{"role": "user", "content": prompt}],
+            response_format={"type": "json_object"}
+        )
+        try:
+            translations = json.loads(response.choices[0].message.content)["translations"]
+            if len(translations) == len(texts) and all(isinstance(t, str) for t in translations):
+                return translations
+        except (ValueError, KeyError, TypeError):
+            pass
+        return [self.translate_text(text, target_language) for text in texts]
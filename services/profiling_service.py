@@ -0,0 +1,143 @@
+import cProfile
+import marshal
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+from utils.constants import PROFILING_SAMPLE_INTERVAL_SECONDS, PROFILING_TOP_FUNCTIONS
+
+class ProfilingService:
+    """
+    Opt-in per-job profiling.
+    'cprofile' records a deterministic profile downloadable as pstats;
+    'sampling' samples the calling thread's stack and produces collapsed stacks
+    for flamegraph tools. With no mode, capture() does nothing
+    """
+    MODES = ('cprofile', 'sampling')
+    # Since Python 3.12 cProfile hooks an interpreter-wide sys.monitoring tool,
+    # so only one deterministic profile can run in the process at a time
+    _cprofile_lock = threading.Lock()
+
+    @staticmethod
+    @contextmanager
+    def capture(label: str, mode: Optional[str] = None):
+        """
+        Profile the enclosed block. Yields a report dict that is filled in
+        when the block exits, or None when profiling is off.
+        If cProfile is busy with another job, the block is sampled instead
+        and the report's 'note' says so
+        """
+        if mode is None:
+            yield None
+            return
+        if mode not in ProfilingService.MODES:
+            raise ValueError(f"Unsupported profiling mode: {mode}")
+
+        report = {'label': label, 'mode': mode, 'started_at': time.time(), 'note': None}
+        profiler = None
+        if mode == 'cprofile':
+            if ProfilingService._cprofile_lock.acquire(blocking=False):
+                profiler = cProfile.Profile()
+                try:
+                    profiler.enable()
+                except ValueError:
+                    # Another profiling tool (e.g. a debugger) owns sys.monitoring
+                    ProfilingService._cprofile_lock.release()
+                    profiler = None
+            if profiler is None:
+                report['mode'] = 'sampling'
+                report['note'] = "cProfile was busy, so this job was sampled instead"
+
+        if profiler is not None:
+            try:
+                yield report
+            finally:
+                profiler.disable()
+                ProfilingService._cprofile_lock.release()
+                report.update(ProfilingService._cprofile_report(profiler))
+                report['duration'] = time.time() - report['started_at']
+        else:
+            sampler = _StackSampler(threading.get_ident(), PROFILING_SAMPLE_INTERVAL_SECONDS)
+            sampler.start()
+            try:
+                yield report
+            finally:
+                sampler.stop()
+                report.update(ProfilingService._sampling_report(sampler.stacks))
+                report['duration'] = time.time() - report['started_at']
+
+    @staticmethod
+    def _function_name(code_key) -> str:
+        filename, line, name = code_key
+        return f"{name} ({filename}:{line})"
+
+    @staticmethod
+    def _cprofile_report(profiler: cProfile.Profile) -> Dict[str, Any]:
+        stats = pstats.Stats(profiler)
+        rows = []
+        for func, (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({
+                'function': ProfilingService._function_name(func),
+                'calls': calls,
+                'self_seconds': round(tottime, 4),
+                'total_seconds': round(cumtime, 4)
+            })
+        rows.sort(key=lambda row: row['self_seconds'], reverse=True)
+        return {
+            'top': rows[:PROFILING_TOP_FUNCTIONS],
+            # Same content as pstats.Stats.dump_stats, loadable with pstats.Stats(path)
+            'pstats': marshal.dumps(stats.stats),
+            'collapsed': None
+        }
+
+    @staticmethod
+    def _sampling_report(stacks: Counter) -> Dict[str, Any]:
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in stacks.items():
+            self_counts[stack[-1]] += count
+            for frame in set(stack):
+                total_counts[frame] += count
+        n_samples = sum(stacks.values()) or 1
+        rows = [{
+            'function': frame,
+            'samples': self_counts[frame],
+            'self_percent': round(100 * self_counts[frame] / n_samples, 1),
+            'total_percent': round(100 * total_counts[frame] / n_samples, 1)
+        } for frame in total_counts]
+        rows.sort(key=lambda row: row['samples'], reverse=True)
+        return {
+            'top': rows[:PROFILING_TOP_FUNCTIONS],
+            'pstats': None,
+            # Brendan Gregg's collapsed format, accepted by flamegraph.pl and speedscope
+            'collapsed': "\n".join(f"{';'.join(stack)} {count}" for stack, count in stacks.most_common())
+        }
+
+
+class _StackSampler(threading.Thread):
+    """Background thread that periodically records another thread's stack"""
+
+    def __init__(self, target_ident: int, interval: float):
+        super().__init__(daemon=True)
+        self.target_ident = target_ident
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.target_ident)
+            stack: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+from utils.constants import RESULT_STORE_FILENAME
+
+class ResultStore:
+    """
+    Shared on-disk store for processed results, keyed by job ID.
+    Holds the heavy fields (rendered subtitles and segment lists) so that
+    session state only needs to keep small views
+    """
+    HEAVY_FIELDS = ('original', 'translated', 'segments', 'translated_segments')
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.path.join(tempfile.gettempdir(), RESULT_STORE_FILENAME)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    job_id TEXT PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_session ON results (session_id)")
+
+    @staticmethod
+    def digest(data: Dict[str, Any]) -> str:
+        """
+        Content hash of the heavy fields of a result
+        """
+        payload = json.dumps([data.get(field) for field in ResultStore.HEAVY_FIELDS],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def save(self, job_id: str, session_id: str, data: Dict[str, Any]) -> str:
+        """
+        Store the heavy fields of a result and return their digest
+        """
+        heavy = {field: data.get(field) for field in self.HEAVY_FIELDS}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (job_id, session_id, data, updated_at) VALUES (?, ?, ?, ?)",
+                (job_id, session_id, json.dumps(heavy), time.time())
+            )
+        return self.digest(heavy)
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the heavy fields of a result, or None if it is not stored
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM results WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, job_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results WHERE job_id = ?", (job_id,))
+
+    def purge_older_than(self, max_age_seconds: float):
+        """
+        Delete results not updated within max_age_seconds
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results WHERE updated_at < ?", (time.time() - max_age_seconds,))
+
+    def delete_session(self, session_id: str):
+        """
+        Delete every result owned by a session
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results WHERE session_id = ?", (session_id,))
+
+
+class ResultCache:
+    """
+    Per-session LRU cache of loaded results bounded by an estimated memory size.
+    An entry may also carry the result's segment edit history under 'history'
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+
+    @staticmethod
+    def estimate_size(data: Dict[str, Any]) -> int:
+        size = 0
+        for field in ResultStore.HEAVY_FIELDS:
+            value = data.get(field)
+            if isinstance(value, str):
+                size += len(value)
+            elif isinstance(value, list):
+                # Rough per-segment overhead of the dict and its floats
+                size += sum(len(segment.get('text', '')) + 200 for segment in value)
+        # An edit history kept with the result counts against the same budget
+        history = data.get('history')
+        if history is not None:
+            size += history.estimate_size()
+        return size
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if job_id not in self._entries:
+            return None
+        self._entries.move_to_end(job_id)
+        return self._entries[job_id]
+
+    def put(self, job_id: str, data: Dict[str, Any]):
+        self.discard(job_id)
+        self._entries[job_id] = data
+        self._sizes[job_id] = self.estimate_size(data)
+        # Evict least recently used results, always keeping the newest one
+        while len(self._entries) > 1 and sum(self._sizes.values()) > self.max_bytes:
+            evicted, _ = self._entries.popitem(last=False)
+            del self._sizes[evicted]
+
+    def discard(self, job_id: str):
+        self._entries.pop(job_id, None)
+        self._sizes.pop(job_id, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
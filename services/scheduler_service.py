@@ -0,0 +1,177 @@
+import threading
+import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from utils.constants import (
+    SCHEDULER_MAX_RUNNING_JOBS, SCHEDULER_MAX_QUEUED_JOBS,
+    SCHEDULER_MAX_QUEUED_PER_SESSION, SCHEDULER_RESOURCE_LIMITS
+)
+
+class AdmissionError(Exception):
+    """Raised when the job queue is too deep to accept more work"""
+
+
+class SchedulerService:
+    """
+    Process-wide job scheduler shared by all sessions.
+    Jobs wait in per-session FIFO queues and are started round-robin across
+    sessions, at most one running job per session; ffmpeg and API work is
+    further limited by global resource slots
+    """
+
+    def __init__(self, max_running_jobs: int = SCHEDULER_MAX_RUNNING_JOBS,
+                 max_queued_jobs: int = SCHEDULER_MAX_QUEUED_JOBS,
+                 max_queued_per_session: int = SCHEDULER_MAX_QUEUED_PER_SESSION,
+                 resource_limits: Optional[Dict[str, int]] = None):
+        self.max_running_jobs = max_running_jobs
+        self.max_queued_jobs = max_queued_jobs
+        self.max_queued_per_session = max_queued_per_session
+        self._cond = threading.Condition()
+        # session_id -> queue of waiting tickets
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._running: Dict[str, str] = {}
+        # session_id -> sequence number of its last started job
+        self._last_served: Dict[str, int] = {}
+        self._served = 0
+        self._cancelled = set()
+        self._resources = {
+            name: threading.BoundedSemaphore(limit)
+            for name, limit in (resource_limits or SCHEDULER_RESOURCE_LIMITS).items()
+        }
+
+    def submit(self, session_id: str) -> str:
+        """
+        Queue a job for a session and return its ticket.
+        Raises AdmissionError when the global or per-session queue is full
+        """
+        with self._cond:
+            queued = sum(len(queue) for queue in self._queues.values())
+            if queued >= self.max_queued_jobs:
+                raise AdmissionError(f"The server is busy ({queued} jobs queued). Please try again later.")
+            queue = self._queues.get(session_id)
+            if queue is not None and len(queue) >= self.max_queued_per_session:
+                raise AdmissionError(f"You already have {len(queue)} jobs queued. Please wait for them to finish.")
+
+            ticket = uuid.uuid4().hex
+            self._queues.setdefault(session_id, deque()).append(ticket)
+            self._dispatch_locked()
+            return ticket
+
+    def position(self, ticket: str) -> int:
+        """
+        Position of a ticket in the queue (1 is next), or 0 if it is running
+        """
+        with self._cond:
+            return self._position_locked(ticket)
+
+    def wait_turn(self, ticket: str, on_wait: Optional[Callable[[int], None]] = None,
+                  poll_seconds: float = 1.0):
+        """
+        Block until the ticket is started, reporting its queue position through on_wait.
+        on_wait is called on every poll, not only when the position changes, so a
+        caller that is being stopped gets a chance to raise and withdraw its ticket
+        """
+        while True:
+            with self._cond:
+                if ticket in self._running:
+                    return
+                if ticket in self._cancelled:
+                    self._cancelled.discard(ticket)
+                    raise AdmissionError("The job was cancelled")
+                position = self._position_locked(ticket)
+            if on_wait:
+                on_wait(position)
+            with self._cond:
+                # Skip the wait if the ticket moved while on_wait ran
+                if (ticket not in self._running and ticket not in self._cancelled
+                        and self._position_locked(ticket) == position):
+                    self._cond.wait(poll_seconds)
+
+    def finish(self, ticket: str):
+        """
+        Release a running ticket or withdraw a waiting one
+        """
+        with self._cond:
+            self._cancelled.discard(ticket)
+            if self._running.pop(ticket, None) is None:
+                for session_id, queue in list(self._queues.items()):
+                    if ticket in queue:
+                        queue.remove(ticket)
+                        if not queue:
+                            del self._queues[session_id]
+                        break
+            self._dispatch_locked()
+            self._cond.notify_all()
+
+    def cancel_session(self, session_id: str):
+        """
+        Withdraw every waiting ticket of a session
+        """
+        with self._cond:
+            queue = self._queues.pop(session_id, None)
+            if queue:
+                self._cancelled.update(queue)
+            self._last_served.pop(session_id, None)
+            self._cond.notify_all()
+
+    @contextmanager
+    def resource(self, name: str):
+        """
+        Hold one global slot of a limited resource ('ffmpeg' or 'api')
+        """
+        semaphore = self._resources[name]
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                'running': len(self._running),
+                'queued': sum(len(queue) for queue in self._queues.values()),
+                'sessions': len(self._queues)
+            }
+
+    def _session_order_locked(self):
+        """
+        Sessions with waiting tickets, least recently served first
+        """
+        return sorted(self._queues, key=lambda sid: self._last_served.get(sid, -1))
+
+    def _grant_order_locked(self):
+        """
+        Waiting tickets in the order they will be started (round-robin across sessions)
+        """
+        queues = [list(self._queues[sid]) for sid in self._session_order_locked()]
+        order = []
+        depth = 0
+        while any(depth < len(queue) for queue in queues):
+            order.extend(queue[depth] for queue in queues if depth < len(queue))
+            depth += 1
+        return order
+
+    def _position_locked(self, ticket: str) -> int:
+        if ticket in self._running:
+            return 0
+        order = self._grant_order_locked()
+        return order.index(ticket) + 1 if ticket in order else 0
+
+    def _dispatch_locked(self):
+        while len(self._running) < self.max_running_jobs:
+            # A session's script thread runs its jobs one at a time, so sessions
+            # that already have a running job are skipped
+            busy = set(self._running.values())
+            session_id = next((sid for sid in self._session_order_locked() if sid not in busy), None)
+            if session_id is None:
+                break
+            queue = self._queues[session_id]
+            ticket = queue.popleft()
+            if not queue:
+                del self._queues[session_id]
+            self._running[ticket] = session_id
+            self._served += 1
+            self._last_served[session_id] = self._served
+        self._cond.notify_all()
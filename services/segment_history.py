@@ -0,0 +1,159 @@
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple
+from utils.constants import SEGMENT_HISTORY_MAX_VERSIONS
+
+class SegmentHistory:
+    """
+    Versioned segment store with undo/redo.
+    Each version maps track names (e.g. 'segments', 'translated_segments') to an
+    immutable chunked list of read-only cues. Cues and chunks that do not change
+    are shared between versions, so a snapshot costs O(1) and an edit only copies
+    the chunks it touches
+    """
+    CHUNK_SIZE = 32
+
+    def __init__(self, tracks: Dict[str, List[Dict[str, Any]]], label: str = "Initial",
+                 max_versions: int = SEGMENT_HISTORY_MAX_VERSIONS):
+        self.max_versions = max_versions
+        self._versions: List[Dict[str, Any]] = [{
+            'label': label,
+            'tracks': {name: self._build(segments, None) for name, segments in tracks.items()}
+        }]
+        self._cursor = 0
+
+    @staticmethod
+    def _freeze(segment: Dict[str, Any]) -> MappingProxyType:
+        return segment if isinstance(segment, MappingProxyType) else MappingProxyType(dict(segment))
+
+    @classmethod
+    def _build(cls, segments: List[Dict[str, Any]], previous: Optional[Tuple[tuple, ...]]) -> Tuple[tuple, ...]:
+        """
+        Build a chunked list, reusing cues and chunks of `previous` that are unchanged
+        """
+        previous = previous or ()
+        chunks = []
+        for chunk_index, offset in enumerate(range(0, len(segments), cls.CHUNK_SIZE)):
+            old_chunk = previous[chunk_index] if chunk_index < len(previous) else ()
+            chunk = []
+            for i, segment in enumerate(segments[offset:offset + cls.CHUNK_SIZE]):
+                old_cue = old_chunk[i] if i < len(old_chunk) else None
+                chunk.append(old_cue if old_cue is not None and old_cue == segment else cls._freeze(segment))
+            chunk = tuple(chunk)
+            if len(chunk) == len(old_chunk) and all(a is b for a, b in zip(chunk, old_chunk)):
+                chunk = old_chunk
+            chunks.append(chunk)
+        return tuple(chunks)
+
+    def _push(self, tracks: Dict[str, Tuple[tuple, ...]], label: str) -> int:
+        # A new edit discards the redo branch
+        del self._versions[self._cursor + 1:]
+        self._versions.append({'label': label, 'tracks': tracks})
+        if len(self._versions) > self.max_versions:
+            del self._versions[0]
+        self._cursor = len(self._versions) - 1
+        return self._cursor
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        The current version; it is never mutated, so holding on to it is free
+        """
+        return self._versions[self._cursor]
+
+    def commit(self, tracks: Dict[str, List[Dict[str, Any]]], label: str) -> int:
+        """
+        Record new segment lists for some tracks; other tracks are shared unchanged
+        """
+        current = self.snapshot()['tracks']
+        new_tracks = dict(current)
+        for name, segments in tracks.items():
+            new_tracks[name] = self._build(segments, current.get(name))
+        return self._push(new_tracks, label)
+
+    def set_segment(self, track: str, index: int, label: str, **changes) -> int:
+        """
+        Change fields of a single cue, copying only the chunk that holds it
+        """
+        chunks = self.snapshot()['tracks'][track]
+        chunk_index, i = divmod(index, self.CHUNK_SIZE)
+        if index < 0 or chunk_index >= len(chunks) or i >= len(chunks[chunk_index]):
+            raise ValueError("Invalid segment index")
+        chunk = list(chunks[chunk_index])
+        chunk[i] = self._freeze({**chunk[i], **changes})
+        new_chunks = chunks[:chunk_index] + (tuple(chunk),) + chunks[chunk_index + 1:]
+        return self._push({**self.snapshot()['tracks'], track: new_chunks}, label)
+
+    def can_undo(self) -> bool:
+        return self._cursor > 0
+
+    def can_redo(self) -> bool:
+        return self._cursor < len(self._versions) - 1
+
+    def undo(self) -> bool:
+        if not self.can_undo():
+            return False
+        self._cursor -= 1
+        return True
+
+    def redo(self) -> bool:
+        if not self.can_redo():
+            return False
+        self._cursor += 1
+        return True
+
+    def labels(self) -> List[str]:
+        return [version['label'] for version in self._versions]
+
+    @property
+    def cursor(self) -> int:
+        return self._cursor
+
+    def estimate_size(self) -> int:
+        """
+        Rough memory size of all versions; chunks and cues shared between
+        versions are counted once
+        """
+        seen = set()
+        size = 0
+        for version in self._versions:
+            for chunks in version['tracks'].values():
+                for chunk in chunks:
+                    if id(chunk) in seen:
+                        continue
+                    seen.add(id(chunk))
+                    for cue in chunk:
+                        if id(cue) not in seen:
+                            seen.add(id(cue))
+                            size += len(cue.get('text', '')) + 200
+        return size
+
+    def segments(self, track: str, version: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Materialize a track of a version as a list of plain dicts
+        """
+        index = self._cursor if version is None else version
+        chunks = self._versions[index]['tracks'].get(track, ())
+        return [dict(cue) for chunk in chunks for cue in chunk]
+
+    def diff(self, track: str, old_version: int, new_version: int) -> List[Dict[str, Any]]:
+        """
+        Cues that differ between two versions of a track.
+        Chunks shared by both versions are skipped without comparing their cues
+        """
+        old_chunks = self._versions[old_version]['tracks'].get(track, ())
+        new_chunks = self._versions[new_version]['tracks'].get(track, ())
+        changes = []
+        for chunk_index in range(max(len(old_chunks), len(new_chunks))):
+            old_chunk = old_chunks[chunk_index] if chunk_index < len(old_chunks) else ()
+            new_chunk = new_chunks[chunk_index] if chunk_index < len(new_chunks) else ()
+            if old_chunk is new_chunk:
+                continue
+            for i in range(max(len(old_chunk), len(new_chunk))):
+                before = old_chunk[i] if i < len(old_chunk) else None
+                after = new_chunk[i] if i < len(new_chunk) else None
+                if before is not after and before != after:
+                    changes.append({
+                        'index': chunk_index * self.CHUNK_SIZE + i,
+                        'before': dict(before) if before is not None else None,
+                        'after': dict(after) if after is not None else None
+                    })
+        return changes
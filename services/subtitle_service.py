@@ -1,7 +1,19 @@
 from typing import List
 import datetime
+import re
 
 class SubtitleService:
+    @staticmethod
+    def format_timestamp(seconds: float, separator: str = ',') -> str:
+        """
+        Format seconds as a zero-padded HH:MM:SS,mmm timestamp (SRT; VTT uses '.')
+        """
+        total_ms = max(int(round(seconds * 1000)), 0)
+        hours, rest = divmod(total_ms, 3600000)
+        minutes, rest = divmod(rest, 60000)
+        secs, ms = divmod(rest, 1000)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{ms:03d}"
+
     @staticmethod
     def create_srt(segments: List[dict]) -> str:
         """
@@ -9,12 +21,9 @@ class SubtitleService:
         """
         srt_content = []
         for i, segment in enumerate(segments, 1):
-            start = datetime.timedelta(seconds=segment['start'])
-            end = datetime.timedelta(seconds=segment['end'])
-            
             # Format timestamp as required by SRT
-            start_str = str(start).replace('.', ',')[:12]
-            end_str = str(end).replace('.', ',')[:12]
+            start_str = SubtitleService.format_timestamp(segment['start'])
+            end_str = SubtitleService.format_timestamp(segment['end'])
             
             srt_content.append(f"{i}\n{start_str} --> {end_str}\n{segment['text']}\n")
         
@@ -27,12 +36,9 @@ class SubtitleService:
         """
         vtt_content = ["WEBVTT\n"]
         for segment in segments:
-            start = datetime.timedelta(seconds=segment['start'])
-            end = datetime.timedelta(seconds=segment['end'])
-            
             # Format timestamp as required by WebVTT
-            start_str = str(start)[:11].replace(',', '.')
-            end_str = str(end)[:11].replace(',', '.')
+            start_str = SubtitleService.format_timestamp(segment['start'], '.')
+            end_str = SubtitleService.format_timestamp(segment['end'], '.')
             
             vtt_content.append(f"\n{start_str} --> {end_str}\n{segment['text']}")
         
@@ -107,3 +113,119 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             raise ValueError(f"Unsupported subtitle format: {format}")
             
         return format_functions[format](segments)
+
+    @staticmethod
+    def parse_timestamp(timestamp: str) -> float:
+        """
+        Convert an SRT/VTT/ASS timestamp (H:MM:SS,mmm, MM:SS.mmm or H:MM:SS.cc) to seconds
+        """
+        parts = timestamp.strip().replace(',', '.').split(':')
+        if len(parts) == 4:
+            # Centiseconds written with a colon separator
+            parts = parts[:2] + [f"{parts[2]}.{parts[3]}"]
+        if len(parts) == 2:
+            parts = ['0'] + parts
+        if len(parts) != 3:
+            raise ValueError(f"Invalid timestamp: {timestamp}")
+        hours, minutes, seconds = parts
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    @staticmethod
+    def parse_srt(content: str) -> List[dict]:
+        """
+        Parse SRT (or WebVTT cue blocks) into segments
+        """
+        segments = []
+        for block in re.split(r'\n\s*\n', content.replace('\r\n', '\n').strip()):
+            lines = [line for line in block.split('\n')]
+            for index, line in enumerate(lines):
+                if '-->' in line:
+                    start, end = line.split('-->', 1)
+                    # WebVTT cue settings may follow the end timestamp
+                    end = end.strip().split(' ')[0]
+                    text = '\n'.join(lines[index + 1:]).strip()
+                    if text:
+                        segments.append({
+                            'start': SubtitleService.parse_timestamp(start),
+                            'end': SubtitleService.parse_timestamp(end),
+                            'text': text
+                        })
+                    break
+        return segments
+
+    @staticmethod
+    def parse_vtt(content: str) -> List[dict]:
+        """
+        Parse WebVTT into segments, skipping the header and NOTE/STYLE/REGION blocks
+        """
+        blocks = re.split(r'\n\s*\n', content.replace('\r\n', '\n').strip())
+        cue_blocks = [
+            block for block in blocks
+            if not block.startswith(('WEBVTT', 'NOTE', 'STYLE', 'REGION'))
+        ]
+        return SubtitleService.parse_srt('\n\n'.join(cue_blocks))
+
+    @staticmethod
+    def parse_ass(content: str) -> List[dict]:
+        """
+        Parse ASS/SSA Dialogue events into segments, dropping override tags
+        """
+        segments = []
+        fields = ['Layer', 'Start', 'End', 'Style', 'Name', 'MarginL', 'MarginR', 'MarginV', 'Effect', 'Text']
+        in_events = False
+        for line in content.replace('\r\n', '\n').split('\n'):
+            line = line.strip()
+            if line.startswith('['):
+                in_events = line.lower() == '[events]'
+            elif in_events and line.startswith('Format:'):
+                fields = [field.strip() for field in line[len('Format:'):].split(',')]
+            elif in_events and line.startswith('Dialogue:'):
+                values = line[len('Dialogue:'):].strip().split(',', len(fields) - 1)
+                if len(values) != len(fields):
+                    continue
+                event = dict(zip(fields, values))
+                text = re.sub(r'\{[^}]*\}', '', event['Text'])
+                text = text.replace('\\N', '\n').replace('\\n', '\n').strip()
+                if text:
+                    segments.append({
+                        'start': SubtitleService.parse_timestamp(event['Start']),
+                        'end': SubtitleService.parse_timestamp(event['End']),
+                        'text': text
+                    })
+        return segments
+
+    @staticmethod
+    def parse_sub(content: str, fps: float = 23.976) -> List[dict]:
+        """
+        Parse MicroDVD SUB into segments
+        """
+        segments = []
+        for line in content.replace('\r\n', '\n').split('\n'):
+            match = re.match(r'\{(\d+)\}\{(\d+)\}(.*)', line.strip())
+            if not match:
+                continue
+            text = re.sub(r'\{[^}]*\}', '', match.group(3)).replace('|', '\n').strip()
+            if text:
+                segments.append({
+                    'start': int(match.group(1)) / fps,
+                    'end': int(match.group(2)) / fps,
+                    'text': text
+                })
+        return segments
+
+    @staticmethod
+    def parse_subtitles(content: str, format: str, fps: float = 23.976) -> List[dict]:
+        """
+        Parse subtitles in the specified format into segments
+        """
+        parse_functions = {
+            'srt': SubtitleService.parse_srt,
+            'vtt': SubtitleService.parse_vtt,
+            'ass': SubtitleService.parse_ass,
+            'sub': lambda text: SubtitleService.parse_sub(text, fps)
+        }
+
+        if format not in parse_functions:
+            raise ValueError(f"Unsupported subtitle format: {format}")
+
+        return parse_functions[format](content)
@@ -1,5 +1,7 @@
 from typing import List, Dict, Any
 import datetime
+import numpy as np
+from services.vad_service import VadService
 
 class TimingService:
     @staticmethod
@@ -41,10 +43,98 @@ class TimingService:
         if segment_index < 0 or segment_index >= len(segments):
             raise ValueError("Invalid segment index")
 
+        # Copy the edited segment too, so the caller's segment dicts are never mutated
         adjusted_segments = segments.copy()
+        segment = dict(segments[segment_index])
         if new_start is not None:
-            adjusted_segments[segment_index]['start'] = max(0, new_start)
+            segment['start'] = max(0, new_start)
         if new_end is not None:
-            adjusted_segments[segment_index]['end'] = max(new_start, new_end)
+            segment['end'] = max(segment['start'], new_end)
+        adjusted_segments[segment_index] = segment
 
         return adjusted_segments
+
+    @staticmethod
+    def apply_linear_timing(segments: List[Dict[str, Any]], offset_seconds: float,
+                            scale_factor: float = 1.0) -> List[Dict[str, Any]]:
+        """
+        Map every timestamp t to t * scale_factor + offset_seconds
+        """
+        adjusted_segments = []
+        for segment in segments:
+            adjusted_segments.append({
+                **segment,
+                'start': max(0, segment['start'] * scale_factor + offset_seconds),
+                'end': max(0, segment['end'] * scale_factor + offset_seconds)
+            })
+        return adjusted_segments
+
+    @staticmethod
+    def speech_envelope(wav_path: str, rate: int = 100) -> np.ndarray:
+        """
+        Speech-activity envelope of a WAV file sampled at `rate` Hz, scaled to [0, 1]
+        """
+        samples, sample_rate = VadService.read_wav(wav_path)
+        hop = sample_rate // rate
+        n_frames = len(samples) // hop
+        if n_frames == 0:
+            return np.zeros(0)
+        frames = samples[:n_frames * hop].reshape(n_frames, hop)
+        energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        floor, peak = np.percentile(energy_db, [10, 95])
+        return np.clip((energy_db - floor) / max(peak - floor, 1e-6), 0.0, 1.0)
+
+    @staticmethod
+    def cue_activity(segments: List[Dict[str, Any]], length: int, rate: int = 100,
+                     scale_factor: float = 1.0) -> np.ndarray:
+        """
+        Binary signal that is 1 while a (scaled) cue is displayed
+        """
+        signal = np.zeros(length)
+        for segment in segments:
+            start = int(segment['start'] * scale_factor * rate)
+            end = int(segment['end'] * scale_factor * rate)
+            signal[max(start, 0):max(min(end, length), 0)] = 1.0
+        return signal
+
+    @staticmethod
+    def auto_sync(wav_path: str, segments: List[Dict[str, Any]], max_offset_seconds: float = 30.0,
+                  max_drift: float = 0.0, drift_steps: int = 21, rate: int = 100) -> Dict[str, float]:
+        """
+        Find the offset (and optionally linear drift) that best aligns the cues with
+        speech in the audio, using FFT-based cross-correlation.
+        Returns {'offset', 'scale', 'confidence'}; apply with apply_linear_timing
+        """
+        envelope = TimingService.speech_envelope(wav_path, rate)
+        if not segments or len(envelope) == 0:
+            return {'offset': 0.0, 'scale': 1.0, 'confidence': 0.0}
+
+        envelope = envelope - envelope.mean()
+        env_norm = np.linalg.norm(envelope)
+        max_lag = int(max_offset_seconds * rate)
+        cue_length = int(max(segment['end'] for segment in segments) * (1 + max_drift) * rate) + 1
+        length = max(len(envelope), cue_length)
+        n_fft = 1 << int(np.ceil(np.log2(2 * length)))
+        env_spectrum = np.fft.rfft(envelope, n_fft)
+        lags = np.concatenate((np.arange(0, max_lag + 1), np.arange(-max_lag, 0)))
+
+        scales = np.linspace(1 - max_drift, 1 + max_drift, drift_steps) if max_drift > 0 else [1.0]
+        best = {'offset': 0.0, 'scale': 1.0, 'confidence': -np.inf}
+        for scale in scales:
+            cues = TimingService.cue_activity(segments, length, rate, scale)
+            cues = cues - cues.mean()
+            cue_norm = np.linalg.norm(cues)
+            if cue_norm == 0 or env_norm == 0:
+                continue
+            # corr[k] = sum_t envelope[t] * cues[t - k]; lag k shifts the cues later by k frames
+            corr = np.fft.irfft(env_spectrum * np.conj(np.fft.rfft(cues, n_fft)), n_fft)
+            candidates = corr[lags]
+            index = int(np.argmax(candidates))
+            confidence = float(candidates[index] / (env_norm * cue_norm))
+            if confidence > best['confidence']:
+                best = {'offset': lags[index] / rate, 'scale': float(scale), 'confidence': confidence}
+
+        if best['confidence'] == -np.inf:
+            best['confidence'] = 0.0
+        best['offset'] = float(best['offset'])
+        return best
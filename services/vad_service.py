@@ -0,0 +1,162 @@
+import bisect
+import wave
+from typing import List, Dict, Any, Tuple
+import numpy as np
+
+class VadService:
+    """
+    CPU-only voice activity detection over 16-bit mono PCM WAV files
+    """
+    FRAME_MS = 30
+    MIN_SPEECH_MS = 250
+    MIN_SILENCE_MS = 500
+    PADDING_MS = 200
+    ENERGY_MARGIN_DB = 10.0
+    MIN_ENERGY_DB = -50.0
+    SPEECH_BAND_HZ = (300, 3400)
+    MIN_SPEECH_BAND_RATIO = 0.5
+    # Skip rewriting the audio when trimming would remove less than this fraction
+    MIN_TRIM_RATIO = 0.05
+
+    @staticmethod
+    def read_wav(wav_path: str) -> Tuple[np.ndarray, int]:
+        """
+        Read a 16-bit mono WAV file into a float32 array in [-1, 1]
+        """
+        with wave.open(wav_path, 'rb') as wav:
+            if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+                raise ValueError("VAD expects 16-bit mono PCM audio")
+            sample_rate = wav.getframerate()
+            pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i2')
+        return pcm.astype(np.float32) / 32768.0, sample_rate
+
+    @staticmethod
+    def write_wav(wav_path: str, samples: np.ndarray, sample_rate: int):
+        """
+        Write float samples in [-1, 1] as a 16-bit mono WAV file
+        """
+        pcm = np.clip(samples * 32768.0, -32768, 32767).astype('<i2')
+        with wave.open(wav_path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm.tobytes())
+
+    @staticmethod
+    def detect_speech(samples: np.ndarray, sample_rate: int) -> List[Tuple[float, float]]:
+        """
+        Return speech regions as (start, end) seconds.
+        A frame is speech when its energy is above an adaptive noise floor and most
+        of its spectral energy lies in the speech band
+        """
+        frame_len = int(sample_rate * VadService.FRAME_MS / 1000)
+        n_frames = len(samples) // frame_len
+        if n_frames == 0:
+            return []
+
+        frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len)
+        energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        noise_floor = np.percentile(energy_db, 10)
+        threshold = max(noise_floor + VadService.ENERGY_MARGIN_DB, VadService.MIN_ENERGY_DB)
+
+        spectrum = np.abs(np.fft.rfft(frames * np.hanning(frame_len), axis=1)) ** 2
+        freqs = np.fft.rfftfreq(frame_len, 1.0 / sample_rate)
+        low, high = VadService.SPEECH_BAND_HZ
+        band = (freqs >= low) & (freqs <= high)
+        band_ratio = spectrum[:, band].sum(axis=1) / (spectrum.sum(axis=1) + 1e-10)
+
+        is_speech = (energy_db > threshold) & (band_ratio > VadService.MIN_SPEECH_BAND_RATIO)
+
+        # Find runs of speech frames
+        padded = np.concatenate(([False], is_speech, [False])).astype(np.int8)
+        edges = np.diff(padded)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        frame_sec = frame_len / sample_rate
+        duration = len(samples) / sample_rate
+        min_silence = VadService.MIN_SILENCE_MS / 1000
+        min_speech = VadService.MIN_SPEECH_MS / 1000
+        padding = VadService.PADDING_MS / 1000
+
+        # Merge regions separated by short pauses, then drop short blips
+        regions: List[List[float]] = []
+        for start, end in zip(starts * frame_sec, ends * frame_sec):
+            if regions and start - regions[-1][1] < min_silence:
+                regions[-1][1] = end
+            else:
+                regions.append([start, end])
+        regions = [r for r in regions if r[1] - r[0] >= min_speech]
+
+        # Pad regions and merge any that now overlap
+        speech: List[Tuple[float, float]] = []
+        for start, end in regions:
+            start, end = max(0.0, start - padding), min(duration, end + padding)
+            if speech and start <= speech[-1][1]:
+                speech[-1] = (speech[-1][0], end)
+            else:
+                speech.append((start, end))
+        return speech
+
+    @staticmethod
+    def trim_silence(wav_path: str, output_path: str) -> Tuple[str, List[Dict[str, float]]]:
+        """
+        Cut non-speech regions out of a WAV file.
+        Returns the path of the audio to transcribe and an offset map of
+        {'trimmed_start', 'original_start', 'duration'} entries; the map is empty
+        and the input path is returned when trimming is not worthwhile
+        """
+        samples, sample_rate = VadService.read_wav(wav_path)
+        regions = VadService.detect_speech(samples, sample_rate)
+        duration = len(samples) / sample_rate if sample_rate else 0.0
+        speech_duration = sum(end - start for start, end in regions)
+
+        if not regions or duration - speech_duration < duration * VadService.MIN_TRIM_RATIO:
+            return wav_path, []
+
+        offset_map = []
+        chunks = []
+        trimmed_start = 0.0
+        for start, end in regions:
+            first, last = int(start * sample_rate), int(end * sample_rate)
+            chunks.append(samples[first:last])
+            region_duration = (last - first) / sample_rate
+            offset_map.append({
+                'trimmed_start': trimmed_start,
+                'original_start': first / sample_rate,
+                'duration': region_duration
+            })
+            trimmed_start += region_duration
+
+        VadService.write_wav(output_path, np.concatenate(chunks), sample_rate)
+        return output_path, offset_map
+
+    @staticmethod
+    def map_time(t: float, offset_map: List[Dict[str, float]], is_end: bool = False) -> float:
+        """
+        Map a time on the trimmed timeline back to the original timeline.
+        End times falling exactly on a region boundary stay in the earlier region
+        """
+        if not offset_map:
+            return t
+        starts = [entry['trimmed_start'] for entry in offset_map]
+        index = (bisect.bisect_left(starts, t) if is_end else bisect.bisect_right(starts, t)) - 1
+        entry = offset_map[max(index, 0)]
+        local = min(max(t - entry['trimmed_start'], 0.0), entry['duration'])
+        return entry['original_start'] + local
+
+    @staticmethod
+    def remap_segments(segments: List[Dict[str, Any]], offset_map: List[Dict[str, float]]) -> List[Dict[str, Any]]:
+        """
+        Map segment timings from the trimmed audio back to the original timeline
+        """
+        if not offset_map:
+            return segments
+        remapped = []
+        for segment in segments:
+            remapped.append({
+                **segment,
+                'start': VadService.map_time(segment['start'], offset_map),
+                'end': VadService.map_time(segment['end'], offset_map, is_end=True)
+            })
+        return remapped
@@ -0,0 +1,126 @@
+import json
+import os
+import struct
+from typing import Dict, Any, List, Tuple
+import numpy as np
+from utils.constants import WAVEFORM_BASE_BIN_SAMPLES, WAVEFORM_MAX_POINTS
+
+class WaveformService:
+    """
+    Multi-resolution min/max peak pyramid of a 16-bit mono WAV file.
+    Level 0 holds one (min, max) pair per WAVEFORM_BASE_BIN_SAMPLES samples and
+    each further level halves the resolution; levels are cached as .npy files
+    """
+    BLOCK_BINS = 4096
+
+    @staticmethod
+    def _data_chunk(wav_path: str) -> Tuple[int, int, int]:
+        """
+        Locate the PCM data of a WAV file; returns (offset, n_samples, sample_rate)
+        """
+        with open(wav_path, 'rb') as f:
+            riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+            if riff != b'RIFF' or wave_id != b'WAVE':
+                raise ValueError("Not a WAV file")
+            sample_rate = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    raise ValueError("WAV file has no data chunk")
+                chunk_id, size = struct.unpack('<4sI', header)
+                if chunk_id == b'fmt ':
+                    fmt = f.read(size)
+                    channels, sample_rate = struct.unpack('<HI', fmt[2:8])
+                    bits = struct.unpack('<H', fmt[14:16])[0]
+                    if channels != 1 or bits != 16:
+                        raise ValueError("Waveform expects 16-bit mono PCM audio")
+                    f.seek(size % 2, 1)
+                elif chunk_id == b'data':
+                    if sample_rate is None:
+                        raise ValueError("WAV data chunk precedes its format chunk")
+                    file_size = os.fstat(f.fileno()).st_size
+                    size = min(size, file_size - f.tell())
+                    return f.tell(), size // 2, sample_rate
+                else:
+                    f.seek(size + size % 2, 1)
+
+    @staticmethod
+    def build_pyramid(wav_path: str, cache_dir: str) -> List[str]:
+        """
+        Compute the peak pyramid through a memory map of the WAV file and write it to
+        cache_dir. Returns the written file paths; an existing cache is reused
+        """
+        meta_path = os.path.join(cache_dir, "waveform.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            return [meta_path] + [os.path.join(cache_dir, name) for name in meta['levels']]
+
+        os.makedirs(cache_dir, exist_ok=True)
+        offset, n_samples, sample_rate = WaveformService._data_chunk(wav_path)
+        bin_samples = WAVEFORM_BASE_BIN_SAMPLES
+        n_bins = max(n_samples // bin_samples, 1)
+
+        # Level 0, computed block by block so only one block is paged in at a time
+        peaks = np.zeros((n_bins, 2), dtype=np.int16)
+        if n_samples:
+            pcm = np.memmap(wav_path, dtype='<i2', mode='r', offset=offset, shape=(n_samples,))
+            for first in range(0, n_bins, WaveformService.BLOCK_BINS):
+                last = min(first + WaveformService.BLOCK_BINS, n_bins)
+                block = pcm[first * bin_samples:last * bin_samples]
+                block = block[:(len(block) // bin_samples) * bin_samples].reshape(-1, bin_samples)
+                if len(block):
+                    peaks[first:first + len(block), 0] = block.min(axis=1)
+                    peaks[first:first + len(block), 1] = block.max(axis=1)
+            del pcm
+
+        levels = []
+        level = 0
+        while True:
+            name = f"level_{level}.npy"
+            np.save(os.path.join(cache_dir, name), peaks)
+            levels.append(name)
+            if len(peaks) <= WAVEFORM_MAX_POINTS:
+                break
+            # Halve the resolution: min of mins and max of maxes of each pair of bins
+            pairs = peaks[:(len(peaks) // 2) * 2].reshape(-1, 2, 2)
+            peaks = np.stack((pairs[:, :, 0].min(axis=1), pairs[:, :, 1].max(axis=1)), axis=1)
+            level += 1
+
+        with open(meta_path, 'w') as f:
+            json.dump({
+                'sample_rate': sample_rate,
+                'base_bin_samples': bin_samples,
+                'duration': n_samples / sample_rate,
+                'levels': levels
+            }, f)
+        return [meta_path] + [os.path.join(cache_dir, name) for name in levels]
+
+    @staticmethod
+    def get_view(cache_dir: str, start: float, end: float,
+                 max_points: int = WAVEFORM_MAX_POINTS) -> Dict[str, Any]:
+        """
+        Peaks between start and end seconds from the finest level that fits in
+        max_points bins. Returns 'time', 'min' and 'max' lists (amplitudes in [-1, 1])
+        and the total 'duration'
+        """
+        with open(os.path.join(cache_dir, "waveform.json")) as f:
+            meta = json.load(f)
+        base_bin_seconds = meta['base_bin_samples'] / meta['sample_rate']
+        end = min(end, meta['duration'])
+
+        for level, name in enumerate(meta['levels']):
+            bin_seconds = base_bin_seconds * (2 ** level)
+            if (end - start) / bin_seconds <= max_points or level == len(meta['levels']) - 1:
+                break
+
+        peaks = np.load(os.path.join(cache_dir, name), mmap_mode='r')
+        first = max(int(start / bin_seconds), 0)
+        last = min(int(np.ceil(end / bin_seconds)), len(peaks))
+        view = np.asarray(peaks[first:last], dtype=np.float32) / 32768.0
+        return {
+            'time': ((np.arange(first, max(last, first)) + 0.5) * bin_seconds).tolist(),
+            'min': view[:, 0].tolist() if len(view) else [],
+            'max': view[:, 1].tolist() if len(view) else [],
+            'duration': meta['duration']
+        }
@@ -1,3 +1,5 @@
+import os
+
 SUPPORTED_LANGUAGES = {
     'English': 'en',
     'Spanish': 'es',
@@ -25,3 +27,85 @@ SUPPORTED_VIDEO_FORMATS = ['mp4', 'mov', 'avi', 'mkv']
 SUPPORTED_SUBTITLE_FORMATS = ['srt', 'vtt', 'ass', 'sub']
 
 TEMP_DIR = "temp"
+
+# Temporary artifact lifecycle
+ARTIFACT_DISK_BUDGET_MB = 2048
+ARTIFACT_SESSION_TTL_SECONDS = 3600
+# Fixed directory under the system temp dir, so job dirs left by a previous process can be swept
+ARTIFACT_BASE_DIRNAME = "vidsubai_artifacts"
+
+# Audio upload encodings for the Whisper API, from highest to lowest fidelity.
+# 'kbps' is the approximate bitrate used to estimate the upload size.
+AUDIO_UPLOAD_ENCODINGS = {
+    'wav': {'extension': 'wav', 'codec_args': ['-c:a', 'pcm_s16le'], 'kbps': 256},
+    'flac': {'extension': 'flac', 'codec_args': ['-c:a', 'flac', '-compression_level', '8'], 'kbps': 120},
+    'mp3': {'extension': 'mp3', 'codec_args': ['-c:a', 'libmp3lame', '-b:a', '32k'], 'kbps': 32},
+    'opus': {'extension': 'ogg', 'codec_args': ['-c:a', 'libopus', '-b:a', '24k', '-application', 'voip'], 'kbps': 24},
+}
+AUDIO_AUTO_ENCODING_ORDER = ['flac', 'mp3', 'opus']
+AUDIO_UPLOAD_TARGET_MB = 5
+
+# Subtitle codec used when muxing soft subtitles into each output container
+MUX_SUBTITLE_CODECS = {
+    'mkv': 'srt',
+    'mp4': 'mov_text',
+}
+
+# ISO 639-2 codes for muxed subtitle track metadata; MP4 and Matroska
+# store three-letter codes (bibliographic forms, as ffmpeg expects)
+MUX_LANGUAGE_CODES = {
+    'en': 'eng',
+    'es': 'spa',
+    'fr': 'fre',
+    'de': 'ger',
+    'it': 'ita',
+    'pt': 'por',
+    'zh': 'chi',
+    'ja': 'jpn',
+    'ko': 'kor',
+    'ru': 'rus',
+    'ar': 'ara',
+    'hi': 'hin',
+    'nl': 'dut',
+    'pl': 'pol',
+    'tr': 'tur',
+    'vi': 'vie',
+    'th': 'tha',
+    'sv': 'swe',
+    'da': 'dan',
+    'fi': 'fin'
+}
+
+# Out-of-session result store
+RESULT_STORE_FILENAME = "vidsubai_results.sqlite"
+RESULT_CACHE_MAX_MB_PER_SESSION = 32
+
+# Cross-session job scheduling
+SCHEDULER_MAX_RUNNING_JOBS = 2
+SCHEDULER_MAX_QUEUED_JOBS = 50
+SCHEDULER_MAX_QUEUED_PER_SESSION = 20
+SCHEDULER_RESOURCE_LIMITS = {
+    'ffmpeg': 2,
+    'api': 4,
+}
+
+# Segment edit history
+SEGMENT_HISTORY_MAX_VERSIONS = 100
+
+# Waveform peak pyramid
+WAVEFORM_BASE_BIN_SAMPLES = 256
+WAVEFORM_MAX_POINTS = 1500
+
+# Subtitle-only batch translation
+TRANSLATION_BATCH_SIZE = 40
+SUBTITLE_BATCH_WORKERS = 4
+
+# Opt-in job profiling
+PROFILING_SAMPLE_INTERVAL_SECONDS = 0.005
+PROFILING_TOP_FUNCTIONS = 25
+PROFILING_MAX_REPORTS = 10
+
+# Persistent subtitle library
+LIBRARY_DB_PATH = os.path.join("data", "subtitle_library.sqlite")
+LIBRARY_SEARCH_LIMIT = 50
+LIBRARY_PAGE_SIZE = 20